@@ -0,0 +1,65 @@
+"""
+Latence d'un scan Playwright : lancement à froid vs pool partagé.
+Usage (depuis backend/) : python -m bench.browser_pool [--runs 10] [--url URL]
+Sans --url, la page est injectée via set_content (aucun accès réseau).
+"""
+import argparse
+import os
+import statistics
+import time
+
+import browser_pool
+
+HTML = "<html><body>" + "".join(
+    f'<div class="vacancies__item"><p>Captain G650 #{i}</p></div>' for i in range(50)
+) + "</body></html>"
+
+
+def _visit(page, url: str | None):
+    if url:
+        page.goto(url, wait_until="domcontentloaded", timeout=30000)
+    else:
+        page.set_content(HTML)
+    return len(page.query_selector_all("div, p"))
+
+
+def cold(url: str | None) -> float:
+    from playwright.sync_api import sync_playwright
+
+    t0 = time.perf_counter()
+    with sync_playwright() as p:
+        exe = os.getenv("PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH")
+        browser = p.chromium.launch(headless=True, **({"executable_path": exe} if exe else {}))
+        _visit(browser.new_page(), url)
+        browser.close()
+    return (time.perf_counter() - t0) * 1000
+
+
+def pooled(url: str | None) -> float:
+    t0 = time.perf_counter()
+    browser_pool.run(lambda page: _visit(page, url))
+    return (time.perf_counter() - t0) * 1000
+
+
+def _report(label: str, samples: list[float]):
+    print(f"{label:<8} n={len(samples):<3} mean={statistics.mean(samples):8.1f}ms "
+          f"p50={statistics.median(samples):8.1f}ms max={max(samples):8.1f}ms")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--url")
+    args = ap.parse_args()
+
+    _report("cold", [cold(args.url) for _ in range(args.runs)])
+    first = pooled(args.url)
+    _report("pooled", [pooled(args.url) for _ in range(args.runs)])
+    print(f"pooled first call (launch included): {first:.1f}ms")
+    rss = browser_pool._descendants_rss_mb(os.getpid())
+    print(f"Chromium RSS (pool ouvert): {rss:.0f} Mo")
+    browser_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
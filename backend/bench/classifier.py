@@ -0,0 +1,183 @@
+"""
+Tri PNT des intitulés sur deux corpus étiquetés (étiquette, source, titre) :
+bench/titles.tsv, qui a servi à écrire les règles (100 % attendu : non-régression),
+et bench/titles_holdout.tsv, étiqueté à la main selon le poste et non selon les
+règles (cas limites : pilote + rôle d'encadrement, recrutement PNT…) ; c'est lui
+qui mesure vraiment l'exactitude et montre les changements de comportement.
+before = règles historiques de chaque scraper (PILOT_RE + EXCLUDE_RE, ou any(k in title) sur PILOT_KW)
+after  = classifier.for_source : une regex par source, titre par titre (is_pilot)
+Affiche précision / rappel / exactitude, débit, et les titres mal classés.
+Usage (depuis backend/) : python -m bench.classifier [--repeat 200] [--runs 5]
+"""
+import argparse
+import re
+import statistics
+import time
+from pathlib import Path
+
+CORPUS = Path(__file__).parent / "titles.tsv"
+HOLDOUT = Path(__file__).parent / "titles_holdout.tsv"
+
+_PILOT_ALL = r'pilots?|captains?|first officers?|second officers?|commanders?|copilots?|f/o|flight crew|flight deck'
+
+
+def _regex(include: str, exclude: str | None = None):
+    inc = re.compile(rf'\b({include})\b', re.I)
+    exc = re.compile(rf'\b({exclude})\b', re.I) if exclude else None
+    return lambda t: bool(inc.search(t)) and not (exc and exc.search(t))
+
+
+def _keywords(words: set[str], exclude: set[str] = frozenset()):
+    return lambda t: any(k in t.lower() for k in words) and not any(k in t.lower() for k in exclude)
+
+
+_ATS = r'pilot|captain|first officer|commandant|copilot|copilote|pnt|f/o'
+_BAMBOOHR = _regex(_ATS, r'ground|dispatch|sales|accountant|mechanic|technician|instructor')
+
+# Règles des scrapers avant classifier.py, telles quelles
+LEGACY = {
+    "Jetfly": _BAMBOOHR,
+    "Comlux": _BAMBOOHR,
+    "Luxaviation": _BAMBOOHR,
+    "DC Aviation": _regex(_ATS),
+    "TAG Aviation": _regex(_ATS),
+    "AstonJet": _regex(_ATS),
+    "Amelia": _keywords({"pilot", "captain", "officier", "pnt", "commandant", "first officer", "copilot"}),
+    "NetJets Europe": _keywords({"pilot", "captain", "first officer", "second in command", "f/o", "pic", "sic"}),
+    "La Compagnie": _keywords({"pilote", "pilot", "captain", "commandant", "first officer", "f/o", "pnt", "copilote"}),
+    "Chalair": _keywords({"pnt", "pilote", "captain", "commandant"},
+                         {"candidature spontanée", "candidature-spontanée"}),
+    "Oyonnair": _keywords({"pilote", "pnt", "commandant", "capitaine", "captain"},
+                          {"régulièrement", "rejoignez-nous", "recrutement", "domaines", "tels que"}),
+    "Pan Européenne": _keywords({"pilot", "captain", "first officer", "f/o", "pnt"}),
+    "Helvetic Airways": _keywords({"pilot", "captain", "first officer", "commander", "copilot", "f/o", "pnt", "crew"},
+                                  {"cabin", "attendant", "steward", "maintenance", "backoffice", "cadet"}),
+    "Elit'Avia": _regex(r'pilot|captain|first officer|commander|copilot|f/o|flight crew|pnt',
+                        r'cabin|attendant|steward|maintenance|head of|travel|operations officer|nominated person'),
+    "Avcon Jet": _regex(r'pilot|captain|first officer|commander|copilot|f/o|flight crew|pnt',
+                        r'cabin|attendant|maintenance|sales|finance|dispatch|controlling|manager|coordinator|specialist|lead'),
+    "Flying Group": _regex(r'pilot|captain|first officer|commander|copilot|f/o|flight crew|pnt',
+                           r'cabin|attendant|steward|maintenance|technician|fueler|desk|driver|chauffeur|occ|'
+                           r'airworthiness|finance|sales|marketing|hr|accounting'),
+    "Air Alliance": _regex(r'pilot|captain|first officer|commander|copilot|f/o|flight crew|pnt|kapitän',
+                           r'cabin|attendant|steward|maintenance|technician|mechanic|arzt|medizin|ärztin|'
+                           r'elektroniker|mechaniker|compliance|initiativ'),
+    "Danish Air Transport": _regex(r'pilots?|captains?|first officers?|commanders?|copilots?|f/o|flight crew|pnt|cps?|fos?',
+                                   r'cabin|attendant|steward|maintenance|engineer|technician|sales|mcc|manager|chief pilot'),
+    "Loganair": _regex(r'pilots?|captains?|first officers?|commanders?|copilots?|f/o|flight crew|flight deck|cps?|fos?',
+                       r'cabin|attendant|steward|maintenance|engineer|technician|finance|sales|account|manager|head of'),
+    "Jet Aviation": _regex(_PILOT_ALL + r'|pnt',
+                           r'cabin|attendant|steward|maintenance|engineer|technician|intern|manager|director|recruiter'),
+    "VistaJet": _regex(_PILOT_ALL + r'|tri|tre|type rating',
+                       r'cabin|attendant|steward|maintenance|engineer|technician|manager|director|recruiter|host'),
+    "Luxair": _regex(_PILOT_ALL, r'cabin|attendant|steward|technician|mechanic|intern|stage|summer|apprenti'),
+    "Platoon Aviation": _regex(_PILOT_ALL + r'|ab.initio',
+                               r'cabin|attendant|steward|maintenance|engineer|dispatcher|recruiter|sales|manager|'
+                               r'controller|head of|CAMO'),
+    "Gama Aviation": _regex(_PILOT_ALL + r'|co-pilots?',
+                            r'cabin|attendant|steward|maintenance|engineer|technician|mechanic|manager|director|'
+                            r'recruiter|trainer|instructor'),
+    "Widerøe": _regex(r'pilots?|captains?|first officers?|copilots?|f/o|flight crew|flight deck',
+                      r'cabin|attendant|steward|maintenance|engineer|technician|manager|director|ekspedit|arbeider'),
+    "Spreeflug": _regex(r'pilots?|captains?|first officers?|commanders?|copilots?|f/o|flight crew|flight deck',
+                        r'cabin|attendant|steward|maintenance|engineer|technician|manager|director|dispatch|sales|'
+                        r'administrative|commercial'),
+    "GlobeAir": _regex(_PILOT_ALL, r'cabin|attendant|steward|maintenance|engineer|technician|manager|director|'
+                                   r'logistics|procurement|marketing|sales|accountant|buchhalter'),
+    "Arcus Air": _regex(_PILOT_ALL, r'cabin|attendant|steward|maintenance|engineer|technician|manager|director|'
+                                    r'dispatcher|sales|operations manager'),
+    "DAS Private Jets": _regex(r'pilots?|captains?|kapit[äa]ns?|first officers?|copilots?|kopilots?|f/o|flight crew|'
+                               r'phenom|embraer|emb\d',
+                               r'sales|verkauf|studium|ausbildung|kaufmann|kauffrau|b[üu]ro|management|'
+                               r'operations manager|dispatch'),
+    "GlobalJet": _regex(r'pilots?|captains?|first officers?|f/o|copilots?|flight crew|'
+                        r'g650|g550|g7500|global\s*6000|falcon|pc-?24|a320|acj|embraer',
+                        r'attendant|steward|dispatcher|engineer|accountant|reservation|purchasing|coordinator|'
+                        r'management|support'),
+    "Air Corsica": _regex(r'pilots?|pilotes?|commandants?\s*de\s*bord|cdb|opl|copilotes?|'
+                          r'captains?|first officers?|f/o|flight crew|flight deck|a320|atr',
+                          r'cabin|h[ô]tesse|hotesse|steward|pnc|maintenance|technicien|escale|'
+                          r'commercial|vente|manager|comptable|informatique|rh|ressources humaines'),
+}
+
+
+def load(path: Path = CORPUS) -> list[tuple[bool, str, str]]:
+    rows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            label, source, title = line.split("\t")
+            rows.append((label == "1", source, title))
+    return rows
+
+
+def scores(rows, predicted: list[bool]) -> str:
+    tp = sum(p and label for (label, _, _), p in zip(rows, predicted))
+    fp = sum(p and not label for (label, _, _), p in zip(rows, predicted))
+    fn = sum(label and not p for (label, _, _), p in zip(rows, predicted))
+    correct = sum(p == label for (label, _, _), p in zip(rows, predicted))
+    return (f"précision {tp / max(tp + fp, 1):6.1%}  rappel {tp / max(tp + fn, 1):6.1%}  "
+            f"exactitude {correct / len(rows):6.1%}  ({fp} faux positifs, {fn} faux négatifs)")
+
+
+def timed(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=200, help="copies du corpus pour la mesure de débit")
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    import classifier
+
+    rows = load()
+    by_source: dict[str, list[str]] = {}
+    for _, source, title in rows:
+        by_source.setdefault(source, []).append(title)
+
+    before = [LEGACY[source](title) for _, source, title in rows]
+    after = [classifier.for_source(source).is_pilot(title) for _, source, title in rows]
+    print(f"{CORPUS.name} : {len(rows)} titres, {len(by_source)} sources, {sum(r[0] for r in rows)} PNT")
+    print(f"  before  {scores(rows, before)}")
+    print(f"  after   {scores(rows, after)}")
+
+    holdout = load(HOLDOUT)
+    h_before = [LEGACY[source](title) for _, source, title in holdout]
+    h_after = [classifier.for_source(source).is_pilot(title) for _, source, title in holdout]
+    print(f"{HOLDOUT.name} : {len(holdout)} titres, {sum(r[0] for r in holdout)} PNT")
+    print(f"  before  {scores(holdout, h_before)}")
+    print(f"  after   {scores(holdout, h_after)}")
+    changed = [(label, source, title, a) for (label, source, title), b, a in zip(holdout, h_before, h_after) if a != b]
+    if changed:
+        print("  Comportement modifié (after) :")
+        for label, source, title, a in changed:
+            print(f"    {'gardé ' if a else 'écarté'}  {'juste' if a == label else 'FAUX '}  {source:<22} {title!r}")
+
+    n = len(rows) * args.repeat
+    work = [(s, titles * args.repeat) for s, titles in by_source.items()]
+    legacy_ms = timed(lambda: [LEGACY[s](t) for s, titles in work for t in titles], args.runs)
+    title_ms = timed(lambda: [classifier.for_source(s).is_pilot(t) for s, titles in work for t in titles], args.runs)
+    print(f"Débit sur {n} titres")
+    for label, ms in (("before (règles du scraper)", legacy_ms), ("after (is_pilot)", title_ms)):
+        print(f"  {label:<28} {ms:9.2f}ms  {n / ms * 1000:12,.0f} titres/s  ×{legacy_ms / ms:4.1f}")
+
+    wrong = [(label, source, title, b) for (label, source, title), b, a in zip(rows, before, after) if a != label]
+    if wrong:
+        print("Mal classés par after :")
+        for label, source, title, b in wrong:
+            print(f"  {'PNT' if label else '---'}  {source:<22} {title!r}{'  (idem before)' if b != label else ''}")
+    fixed = [(source, title) for (label, source, title), b, a in zip(rows, before, after) if b != label and a == label]
+    if fixed:
+        print("Corrigés par rapport à before :")
+        for source, title in fixed:
+            print(f"  {source:<22} {title!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Correspondance KNOWN_COORDS de geocoder.get_coords sur des lieux réels
+(relevés dans la base et les pages des sources), rejoués comme lors d'un scan.
+before = boucle historique sur le dict (`key in loc`, premier trouvé dans l'ordre du dict)
+after  = regex compilée en trie, plus longue clé gagnante ; à froid (LRU vidé) puis LRU chaud
+Affiche aussi les lieux dont le résultat change (ex. « Paris Le Bourget »).
+Puis le gazetteer hors ligne (data/gazetteer.tsv) : latence par recherche et
+lieux qui, sans lui, partiraient vers Nominatim.
+Usage (depuis backend/) : python -m bench.geocoder [--lookups 100000] [--runs 5]
+"""
+import argparse
+import random
+import statistics
+import time
+
+LOCATIONS = [
+    "Geneva", "Abuja", "Luxembourg", "Kuala Lumpur", "Dubai", "Johannesburg", "Subang",
+    "Hong Kong", "Paris", "Saint-Denis", "London, GB, W8 5EH", "Chambéry", "Istanbul",
+    "Europe", "Western Africa", "Vienna", "Germany", "Köln", "Copenhagen", "United Kingdom",
+    "Malta International Airport", "European Union", "Hamburg", "Norwich Hangar 6", "Norway",
+    "Berlin", "Mengen", "Marseille", "Nice", "Bonneuil en France", "Penzance", "Stuttgart",
+    "Paris Le Bourget", "Paris-Le Bourget Airport (LFPB)", "Le Bourget, France",
+    "Genève Aéroport", "Geneva, Switzerland", "Meyrin, Genève", "Zurich Airport, Kloten",
+    "Luxembourg Airport, Senningerberg", "Sandweiler, Luxembourg", "Basel-Mulhouse (Bâle-Mulhouse)",
+    "Milan Malpensa", "Milan Linate, Italy", "London Heathrow", "London Luton",
+    "Farnborough, Hampshire", "Oxford Airport", "Edinburgh, Scotland", "Birmingham, GB",
+    "Munich, Bavaria", "Frankfurt am Main", "Düsseldorf", "Zweibrücken", "Linz", "Antwerp",
+    "Brussels, Belgium", "Charleroi Airport", "Lyon Saint-Exupéry", "Clermont-Ferrand",
+    "Toulouse Blagnac", "Bordeaux-Mérignac", "Nantes", "Rennes", "Brest", "Ajaccio",
+    "Bastia", "Salzburg", "Wien, Österreich", "Oslo Gardermoen", "Stockholm Arlanda",
+    "Bodø", "Tromsø", "Prague", "Madrid Barajas", "Barcelona", "Lisbon", "Rome Ciampino",
+    "Doha, Qatar", "Riyadh", "Abu Dhabi", "Singapore", "Tokyo", "New York, NY", "Miami, FL",
+    "Toronto, ON", "Sao Paulo", "Nairobi", "Lagos", "Ajaccio, FRA", "Beauvais, FRA", "Luxembourg, LUX", "Venice, Italy", "WORLDWIDE", "Multiple locations", "N/C", "",
+]
+
+
+def legacy_match(known: dict, loc_low: str):
+    for key, coords in known.items():
+        if key in loc_low:
+            return coords
+    return None
+
+
+def timed(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lookups", type=int, default=100_000)
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    import geocoder
+
+    rng = random.Random(42)
+    corpus = [rng.choice(LOCATIONS).strip().lower() for _ in range(args.lookups)]
+    distinct = sorted(set(corpus))
+
+    def cold():
+        geocoder.match_known.cache_clear()
+        for loc in distinct:
+            geocoder.match_known(loc)
+
+    before = timed(lambda: [legacy_match(geocoder.KNOWN_COORDS, loc) for loc in corpus], args.runs)
+    after_cold = timed(cold, args.runs) * len(corpus) / len(distinct)
+    after_lru = timed(lambda: [geocoder.match_known(loc) for loc in corpus], args.runs)
+
+    print(f"{len(corpus)} recherches, {len(distinct)} lieux distincts, {len(geocoder.KNOWN_COORDS)} clés")
+    for label, ms in (("before (boucle dict)", before), ("after (regex, sans LRU)", after_cold),
+                      ("after (LRU)", after_lru)):
+        print(f"  {label:<24} {ms:9.2f}ms  {ms * 1000 / len(corpus):6.2f}µs/recherche  ×{before / ms:5.1f}")
+
+    changed = [(loc, legacy_match(geocoder.KNOWN_COORDS, loc), geocoder.match_known(loc))
+               for loc in distinct if legacy_match(geocoder.KNOWN_COORDS, loc) != geocoder.match_known(loc)]
+    if changed:
+        print("Résultats modifiés (plus longue clé gagnante) :")
+        for loc, old, new in changed:
+            print(f"  {loc!r:<40} {old} → {new}")
+
+    def gazetteer_cold():
+        geocoder.gazetteer_lookup.cache_clear()
+        for loc in LOCATIONS:
+            geocoder.gazetteer_lookup(loc)
+
+    ms = timed(gazetteer_cold, args.runs)
+    remote = [loc for loc in LOCATIONS if loc and not geocoder.match_known(loc.lower())]
+    offline = [loc for loc in remote if geocoder.gazetteer_lookup(loc)]
+    print(f"Gazetteer : {ms * 1000 / len(LOCATIONS):6.2f}µs/recherche (sans LRU) ; "
+          f"{len(offline)}/{len(remote)} lieux hors KNOWN_COORDS résolus sans Nominatim")
+    print(f"  restent pour Nominatim : {', '.join(repr(l) for l in remote if l not in offline)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Test de charge de l'API : C clients concurrents (200 par défaut) enchaînent
+/api/status, /api/jobs et des recherches pendant D secondes ; débit et
+latences p50/p99, sans puis avec un scan simulé en cours (threads qui parsent
+du HTML avec BS4 et écrivent via scanner._run_source, comme un vrai scan) :
+d'abord dans le process API (ancienne architecture), puis dans un process
+worker séparé dont les écritures arrivent par la table events.
+Usage (depuis backend/, après pip install -r requirements-dev.txt) :
+  python -m bench.load [--clients 200] [--seconds 10] [--jobs 20000] [--procs 4]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import httpx
+
+BACKEND = Path(__file__).resolve().parent.parent
+PORT = 8766
+WORDS = ["captain", "first", "officer", "geneva", "a320", "copilote", "falcon", "nice"]
+
+
+def start_writers(writers: int, jobs: int, after_write=None):
+    import scanner
+    from bench.persistence import synthetic_jobs
+
+    def scan_loop(k: int):
+        from bs4 import BeautifulSoup
+        html = "".join(f"<div class='job'><a href='/j/{i}'>Captain A320 #{i}</a></div>" for i in range(2000))
+        offset = 0
+        while True:
+            soup = BeautifulSoup(html, "html.parser")
+            _ = [a["href"] for a in soup.select("div.job a")]
+            offset += jobs // 20
+            scanner._run_source(f"Scan{k}", synthetic_jobs(500, f"Scan{k}", offset), 100)
+            if after_write:
+                after_write()
+
+    for k in range(writers):
+        threading.Thread(target=scan_loop, args=(k,), daemon=True).start()
+
+
+def serve(writers: int, jobs: int):
+    """Server side (subprocess): uvicorn on main.app, plus `writers` in-process scan threads."""
+    import uvicorn
+    import events
+    import main
+    import response_cache
+    import storage
+
+    storage.init_db()
+    events.bridge(threading.Event(), on_events=response_cache.bump)
+    start_writers(writers, jobs, response_cache.bump)
+    uvicorn.run(main.app, host="127.0.0.1", port=PORT, log_level="warning", lifespan="off")
+
+
+def scan_worker(writers: int, jobs: int):
+    """Worker side (subprocess): scan threads whose events go through SQLite."""
+    import events
+
+    stop = threading.Event()
+    events.relay(stop)
+    start_writers(writers, jobs)
+    stop.wait()
+
+
+def seed(db: str, n: int):
+    env = {**os.environ, "DB_FILE": db}
+    code = ("import storage; from bench.persistence import synthetic_jobs; storage.init_db(); "
+            f"storage.save_source_result('Bench', synthetic_jobs({n}, 'Bench'), 0)")
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND, env=env, check=True)
+
+
+def pick_url(rng: random.Random) -> str:
+    r = rng.random()
+    if r < 0.5:
+        return "/api/status"
+    if r < 0.8:
+        return f"/api/jobs?status=active&limit=50&source=Bench{'' if rng.random() < 0.5 else '&sort=oldest'}"
+    return f"/api/jobs?q={rng.choice(WORDS)}&limit=20"
+
+
+async def client(http: httpx.AsyncClient, deadline: float, latencies: list[float], errors: list[int], seed_: int):
+    rng = random.Random(seed_)
+    while time.monotonic() < deadline:
+        t0 = time.perf_counter()
+        try:
+            r = await http.get(pick_url(rng))
+            r.raise_for_status()
+        except httpx.HTTPError:
+            errors.append(1)
+            continue
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+
+async def drive(clients: int, seconds: float, first_seed: int) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors: list[int] = []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=30) as http:
+        deadline = time.monotonic() + seconds
+        await asyncio.gather(*(client(http, deadline, latencies, errors, first_seed + i)
+                               for i in range(clients)))
+    return latencies, len(errors)
+
+
+def drive_process(clients: int, seconds: float, first_seed: int) -> tuple[list[float], int]:
+    return asyncio.run(drive(clients, seconds, first_seed))
+
+
+def load(clients: int, seconds: float, procs: int) -> tuple[list[float], int]:
+    """Spread the clients over several processes: one asyncio loop in Python
+    saturates long before the server does."""
+    share = [clients // procs + (i < clients % procs) for i in range(procs)]
+    with ProcessPoolExecutor(procs) as pool:
+        parts = list(pool.map(drive_process, share, [seconds] * procs,
+                              [sum(share[:i]) for i in range(procs)]))
+    return [ms for lat, _ in parts for ms in lat], sum(err for _, err in parts)
+
+
+def run(label: str, writers: int, worker: int, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db")
+        seed(db, args.jobs)
+        env = {**os.environ, "DB_FILE": db}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "bench.load", "--serve", str(writers), "--jobs", str(args.jobs)],
+            cwd=BACKEND, env=env)
+        procs = [server]
+        if worker:
+            procs.append(subprocess.Popen(
+                [sys.executable, "-m", "bench.load", "--scan", str(worker), "--jobs", str(args.jobs)],
+                cwd=BACKEND, env=env))
+        try:
+            for _ in range(100):
+                try:
+                    httpx.get(f"http://127.0.0.1:{PORT}/api/status", timeout=1)
+                    break
+                except httpx.HTTPError:
+                    time.sleep(0.2)
+            latencies, errors = load(args.clients, args.seconds, args.procs)
+        finally:
+            for proc in procs:
+                proc.terminate()
+                proc.wait()
+    latencies.sort()
+    print(f"{label:<16} {len(latencies) / args.seconds:8.0f} req/s  "
+          f"p50 {statistics.median(latencies):7.1f}ms  p99 {latencies[int(len(latencies) * 0.99)]:7.1f}ms  "
+          f"erreurs {errors}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=200)
+    ap.add_argument("--seconds", type=float, default=10)
+    ap.add_argument("--jobs", type=int, default=20_000)
+    ap.add_argument("--procs", type=int, default=4, help="processus clients")
+    ap.add_argument("--writers", type=int, default=2, help="threads de scan simulés")
+    ap.add_argument("--serve", type=int, default=None, help=argparse.SUPPRESS)
+    ap.add_argument("--scan", type=int, default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.serve is not None:
+        serve(args.serve, args.jobs)
+        return
+    if args.scan is not None:
+        scan_worker(args.scan, args.jobs)
+        return
+    run("sans scan", 0, 0, args)
+    run("scan dans l'API", args.writers, 0, args)
+    run("scan worker", 0, args.writers, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Persistance d'un résultat de source : chemin historique (upsert_job par offre,
+puis expire_missing_jobs et update_source_status, une connexion chacun) vs
+save_source_result (une seule transaction, INSERT … ON CONFLICT … RETURNING).
+Usage (depuis backend/) : python -m bench.persistence [--jobs 10000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from models import JobOffer
+
+
+def synthetic_jobs(n: int, source: str, offset: int = 0) -> list[JobOffer]:
+    return [JobOffer(id=f"{source}-{i:06d}", title=f"Captain A320 #{i}",
+                     link=f"https://example.com/jobs/{i}", source=source, location="Geneva")
+            for i in range(offset, offset + n)]
+
+
+def legacy(storage, source: str, jobs: list[JobOffer]) -> int:
+    new = sum(1 for job in jobs if storage.upsert_job(job))
+    storage.expire_missing_jobs(source, {job.id for job in jobs})
+    storage.update_source_status(source, "ok", len(jobs), 0)
+    return new
+
+
+def bulk(storage, source: str, jobs: list[JobOffer]) -> int:
+    new, _ = storage.save_source_result(source, jobs, 0)
+    return len(new)
+
+
+def run(label: str, fn, n: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_FILE"] = os.path.join(tmp, "bench.db")
+        import storage
+        storage.DB_FILE = os.environ["DB_FILE"]
+        storage.init_db()
+        # 1er scan : tout est nouveau ; 2e scan : 90 % revus, 10 % remplacés (→ expirés)
+        for phase, jobs in (("insert", synthetic_jobs(n, "Bench")),
+                            ("rescan", synthetic_jobs(n, "Bench", offset=n // 10))):
+            t0 = time.perf_counter()
+            new = fn(storage, "Bench", jobs)
+            ms = (time.perf_counter() - t0) * 1000
+            print(f"{label:<7} {phase:<7} {n} offres  {ms:9.1f}ms  ({new} nouvelles)")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=10_000)
+    args = ap.parse_args()
+    run("legacy", legacy, args.jobs)
+    run("bulk", bulk, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
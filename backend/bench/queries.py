@@ -0,0 +1,107 @@
+"""
+Requêtes de lecture de l'API sur une table jobs de 1k / 100k / 1M lignes.
+before = schéma historique (clé primaire seule, LOWER(source), 5 COUNT(*))
+after  = index secondaires + source_key + agrégat unique de get_stats
+Affiche le plan (EXPLAIN QUERY PLAN) et la latence médiane de chaque requête.
+Usage (depuis backend/) : python -m bench.queries [--sizes 1000 100000 1000000] [--runs 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SOURCES = [f"Source {i:02d}" for i in range(60)] + ["Widerøe", "Pan Européenne"]
+STATUSES = ["expired"] * 14 + ["active"] * 5 + ["full"]   # archive : l'historique domine
+
+LEGACY_STATS = [
+    "SELECT COUNT(*) FROM jobs",
+    "SELECT COUNT(*) FROM jobs WHERE status='active'",
+    "SELECT COUNT(*) FROM jobs WHERE status='full'",
+    "SELECT COUNT(*) FROM jobs WHERE status='expired'",
+    "SELECT COUNT(*) FROM jobs WHERE status='active' AND first_seen >= datetime('now','-48 hours')",
+]
+LEGACY_BY_SOURCE = "SELECT * FROM jobs WHERE 1=1 AND LOWER(source) = LOWER(?) ORDER BY first_seen DESC"
+LEGACY_BY_STATUS = "SELECT * FROM jobs WHERE 1=1 AND status = ? ORDER BY first_seen DESC"
+INDEXES = ("idx_jobs_recent", "idx_jobs_status_recent", "idx_jobs_source_recent", "idx_jobs_source_status")
+
+
+def populate(storage, n: int):
+    rng = random.Random(42)
+    start = datetime.now() - timedelta(days=3 * 365)
+    rows = []
+    for i in range(n):
+        source = rng.choice(SOURCES)
+        seen = (start + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))).isoformat()
+        rows.append((f"{i:020d}", f"Captain A320 #{i}", f"https://example.com/{i}", "Geneva",
+                     source, storage.source_key(source), rng.choice(STATUSES), seen, seen))
+    with storage.connect() as conn:
+        conn.executemany(
+            """INSERT INTO jobs (id, title, link, location, source, source_key, status,
+                                 first_seen, last_seen)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+
+
+def timed(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def plan(conn, sql: str, params=()) -> str:
+    return " / ".join(r[3] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+def report(label: str, ms: float, plans: list[str]):
+    print(f"  {label:<28} {ms:9.2f}ms  {' | '.join(plans)}")
+
+
+def run(n: int, runs: int):
+    import storage
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DB_FILE = os.path.join(tmp, "bench.db")
+        storage.init_db()
+        populate(storage, n)
+        conn = storage.connect()
+        print(f"\n{n} offres")
+
+        for index in INDEXES:
+            conn.execute(f"DROP INDEX {index}")
+        conn.execute("ANALYZE")
+        print(" before")
+        report("get_stats (5 COUNT)", timed(lambda: [conn.execute(q).fetchone() for q in LEGACY_STATS], runs),
+               [plan(conn, q) for q in LEGACY_STATS[:2]])
+        report("source=Widerøe", timed(lambda: conn.execute(LEGACY_BY_SOURCE, ("Widerøe",)).fetchall(), runs),
+               [plan(conn, LEGACY_BY_SOURCE, ("Widerøe",))])
+        report("status=full", timed(lambda: conn.execute(LEGACY_BY_STATUS, ("full",)).fetchall(), runs),
+               [plan(conn, LEGACY_BY_STATUS, ("full",))])
+
+        storage.init_db()   # recrée les index
+        conn.execute("ANALYZE")
+        print(" after")
+        report("get_stats (agrégat)", timed(storage.get_stats, runs),
+               [plan(conn, storage.STATS_QUERY).split(" / ")[-1]])
+        sql, params = storage.jobs_query(source="Widerøe")
+        report("source=Widerøe", timed(lambda: conn.execute(sql, params).fetchall(), runs),
+               [plan(conn, sql, params)])
+        sql, params = storage.jobs_query(status="full")
+        report("status=full", timed(lambda: conn.execute(sql, params).fetchall(), runs),
+               [plan(conn, sql, params)])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+    for n in args.sizes:
+        run(n, args.runs)
+
+
+if __name__ == "__main__":
+    main()
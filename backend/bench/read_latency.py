@@ -0,0 +1,88 @@
+"""
+Latence des lectures API pendant un scan : un thread écrivain enchaîne des
+save_source_result pendant que N lecteurs chronomètrent get_jobs / get_stats.
+Compare journal_mode=WAL (défaut) et DELETE (mode rollback historique).
+Usage (depuis backend/) : python -m bench.read_latency [--jobs 5000] [--readers 4] [--seconds 5]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from bench.persistence import synthetic_jobs
+
+
+def percentile(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def run(mode: str, n: int, readers: int, seconds: float):
+    import storage
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DB_FILE = os.path.join(tmp, "bench.db")
+        storage.JOURNAL_MODE = mode
+        storage.init_db()
+        storage.save_source_result("Bench", synthetic_jobs(n, "Bench"), 0)
+        # Les lecteurs interrogent une autre source : on mesure l'attente sur la base,
+        # pas la conversion en dicts de milliers de lignes (qui se bat pour le GIL)
+        storage.save_source_result("Other", synthetic_jobs(200, "Other"), 0)
+
+        stop = threading.Event()
+        latencies: list[float] = []
+        errors = 0
+        writes = 0
+        lock = threading.Lock()
+
+        def writer():
+            nonlocal writes
+            offset = 0
+            while not stop.is_set():
+                # Chaque passe remplace 10 % des offres : inserts + expirations
+                offset += n // 10
+                storage.save_source_result("Bench", synthetic_jobs(n, "Bench", offset), 0)
+                writes += 1
+
+        def reader():
+            nonlocal errors
+            local, failed = [], 0
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                try:
+                    storage.get_jobs(source="Other")
+                    storage.get_stats()
+                except Exception:
+                    failed += 1
+                    continue
+                local.append((time.perf_counter() - t0) * 1000)
+            with lock:
+                latencies.extend(local)
+                errors += failed
+
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(readers)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+    print(f"{mode:<7} {len(latencies):6d} lectures  p50 {statistics.median(latencies):7.1f}ms  "
+          f"p99 {percentile(latencies, 0.99):7.1f}ms  max {max(latencies):7.1f}ms  "
+          f"erreurs {errors}  ({writes} scans écrits)")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=5_000)
+    ap.add_argument("--readers", type=int, default=4)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    args = ap.parse_args()
+    for mode in ("DELETE", "WAL"):
+        run(mode, args.jobs, args.readers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Recherche /api/jobs?q= : LIKE '%q%' sur title/location (historique) vs index
+FTS5 (jobs_fts), à mesure que l'archive grossit.
+Usage (depuis backend/) : python -m bench.search [--sizes 1000 100000 1000000] [--runs 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from bench.queries import plan, timed
+
+TITLES = ["Captain A320", "First Officer B737", "Copilote ATR 72", "Commandant de bord Falcon 7X",
+          "Cabin Crew", "Flight Dispatcher", "Type Rated Captain Global 6000", "Co-pilot Embraer"]
+LOCATIONS = ["Genève", "Zürich", "Paris Le Bourget", "Luxembourg", "Nice", "Malta", "Oslo", "Bâle"]
+QUERIES = ["genève", "copilote", "captain glob", "falcon nice"]
+
+LEGACY = """SELECT * FROM jobs WHERE 1=1 AND (LOWER(title) LIKE ? OR LOWER(location) LIKE ?)
+            ORDER BY first_seen DESC"""
+
+
+def populate(storage, n: int):
+    rng = random.Random(7)
+    rows = [(f"{i:020d}", f"{rng.choice(TITLES)} #{i}", "https://example.com", rng.choice(LOCATIONS),
+             "Bench", "bench", "expired", f"2024-{i % 12 + 1:02d}-01T00:00:{i % 60:02d}", "")
+            for i in range(n)]
+    with storage.connect() as conn:
+        conn.executemany(
+            """INSERT INTO jobs (id, title, link, location, source, source_key, status,
+                                 first_seen, last_seen)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+
+
+def run(n: int, runs: int):
+    import storage
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DB_FILE = os.path.join(tmp, "bench.db")
+        storage.init_db()
+        populate(storage, n)
+        conn = storage.connect()
+        print(f"\n{n} offres")
+        for q in QUERIES:
+            # LIKE ne gère ni les accents ni l'ordre des mots : on chronomètre la requête telle quelle
+            like = (f"%{q}%", f"%{q}%")
+            like_rows = len(conn.execute(LEGACY, like).fetchall())
+            like_ms = timed(lambda: conn.execute(LEGACY, like).fetchall(), runs)
+            sql, params = storage.jobs_query(q=q, sort="relevance")
+            fts_rows = len(conn.execute(sql, params).fetchall())
+            fts_ms = timed(lambda: conn.execute(sql, params).fetchall(), runs)
+            print(f"  {q!r:<16} LIKE {like_ms:9.2f}ms ({like_rows:7d})   FTS5 {fts_ms:9.2f}ms ({fts_rows:7d})"
+                  f"   {plan(conn, sql, params)}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+    for n in args.sizes:
+        run(n, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Coût de démarrage du process API : temps d'import et RSS de `import main`.
+lazy  = registre paresseux (état actuel : aucun scraper chargé au boot)
+eager = tous les modules scrapers importés au boot (comportement d'avant le registre)
+Usage (depuis backend/) : python -m bench.startup [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+HEAVY = ("bs4", "playwright.sync_api", "geopy", "requests")
+
+PROBE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+import main
+if {eager}:
+    from scrapers.registry import all_sources
+    for src in all_sources():
+        src.fn
+ms = (time.perf_counter() - t0) * 1000
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({{"ms": ms, "rss_mb": rss_mb, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def probe(eager: bool) -> dict:
+    code = PROBE.format(eager=eager, heavy=HEAVY)
+    env = {**os.environ, "DB_FILE": os.devnull}
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    for label, eager in (("eager", True), ("lazy", False)):
+        runs = [probe(eager) for _ in range(args.runs)]
+        print(f"{label:<6} import={statistics.median(r['ms'] for r in runs):7.1f}ms "
+              f"rss={statistics.median(r['rss_mb'] for r in runs):6.1f}Mo "
+              f"modules lourds={', '.join(runs[0]['heavy']) or '—'}")
+
+
+if __name__ == "__main__":
+    main()
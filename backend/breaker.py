@@ -0,0 +1,34 @@
+"""
+Disjoncteur par source, état persisté dans source_status.
+closed    → la source est scannée normalement.
+open      → après BREAKER_THRESHOLD échecs consécutifs, la source est sautée
+            jusqu'à open_until (backoff exponentiel, plafonné à BREAKER_MAX_HOURS).
+half_open → open_until atteint : un seul scan d'essai. Succès → closed,
+            échec → open avec un backoff doublé.
+"""
+import os
+from datetime import datetime, timedelta
+
+THRESHOLD    = int(os.getenv("BREAKER_THRESHOLD", "3"))
+BASE_MINUTES = int(os.getenv("BREAKER_BASE_MINUTES", "30"))
+MAX_MINUTES  = int(float(os.getenv("BREAKER_MAX_HOURS", "48")) * 60)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+def state(row: dict | None, now: datetime) -> str:
+    """Effective state: an open breaker whose delay has elapsed becomes half-open."""
+    if not row or row.get("circuit_state") in (None, CLOSED):
+        return CLOSED
+    if row.get("circuit_state") == OPEN and row.get("open_until") \
+            and datetime.fromisoformat(row["open_until"]) > now:
+        return OPEN
+    return HALF_OPEN
+
+
+def open_until(fail_streak: int, now: datetime) -> datetime | None:
+    """When to probe again after `fail_streak` consecutive failures, None if still closed."""
+    if fail_streak < THRESHOLD:
+        return None
+    minutes = min(MAX_MINUTES, BASE_MINUTES * 2 ** (fail_streak - THRESHOLD))
+    return now + timedelta(minutes=minutes)
@@ -0,0 +1,159 @@
+"""
+Pool Playwright partagé par les scrapers à rendu JS (GlobalJet, Air Corsica…).
+Chromium est lancé une fois puis gardé entre les scans ; chaque appel à run()
+reçoit un contexte isolé (cookies, cache, storage) jeté après usage.
+L'API sync de Playwright est liée au thread qui l'a démarrée : toutes les pages
+tournent donc sur le thread du pool, les scrapers lui soumettent leur travail.
+Le navigateur est recyclé après BROWSER_MAX_PAGES pages, au-delà de
+BROWSER_MAX_RSS_MB, et fermé après BROWSER_IDLE_SECONDS sans activité.
+"""
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+log = logging.getLogger(__name__)
+
+MAX_PAGES    = int(os.getenv("BROWSER_MAX_PAGES", "50"))
+MAX_RSS_MB   = int(os.getenv("BROWSER_MAX_RSS_MB", "800"))
+IDLE_SECONDS = int(os.getenv("BROWSER_IDLE_SECONDS", "900"))
+
+
+def _descendants_rss_mb(root_pid: int) -> float:
+    """Resident memory of every process spawned below root_pid (Linux /proc only)."""
+    children: dict[int, list[int]] = {}
+    try:
+        pids = [int(d) for d in os.listdir("/proc") if d.isdigit()]
+    except FileNotFoundError:
+        return 0.0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(pid)
+
+    total_kb = 0
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        stack += children.get(pid, [])
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+class BrowserPool:
+    def __init__(self, max_pages: int = MAX_PAGES, max_rss_mb: int = MAX_RSS_MB,
+                 idle_seconds: int = IDLE_SECONDS):
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.idle_seconds = idle_seconds
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._pw = None
+        self._browser = None
+        self._pages = 0
+
+    def run(self, fn: Callable[[Any], Any]) -> Any:
+        """Run fn(page) in a fresh browser context; return its result or re-raise its error."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="browser-pool", daemon=True)
+                self._thread.start()
+        fut: Future = Future()
+        self._jobs.put((fn, fut))
+        return fut.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                self._jobs.put(None)
+                self._thread.join(timeout=30)
+            self._thread = None
+
+    def _loop(self):
+        while True:
+            try:
+                item = self._jobs.get(timeout=self.idle_seconds)
+            except queue.Empty:
+                if self._browser is not None:
+                    log.info("Browser pool: inactif, fermeture de Chromium")
+                    self._close()
+                continue
+            if item is None:
+                self._close()
+                return
+            fn, fut = item
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(self._run(fn))
+            except BaseException as e:
+                fut.set_exception(e)
+
+    def _run(self, fn):
+        if self._browser is None or not self._browser.is_connected():
+            self._launch()
+        context = self._browser.new_context()
+        try:
+            return fn(context.new_page())
+        finally:
+            context.close()
+            self._pages += 1
+            self._maybe_recycle()
+
+    def _launch(self):
+        from playwright.sync_api import sync_playwright
+
+        self._close()
+        exe = os.getenv("PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH")
+        self._pw = sync_playwright().start()
+        self._browser = self._pw.chromium.launch(headless=True, **({"executable_path": exe} if exe else {}))
+        self._pages = 0
+        log.info("Browser pool: Chromium lancé")
+
+    def _maybe_recycle(self):
+        if self._pages >= self.max_pages:
+            log.info(f"Browser pool: recyclage après {self._pages} pages")
+            self._close()
+            return
+        rss = _descendants_rss_mb(os.getpid())
+        if rss > self.max_rss_mb:
+            log.info(f"Browser pool: recyclage, RSS {rss:.0f} Mo > {self.max_rss_mb} Mo")
+            self._close()
+
+    def _close(self):
+        try:
+            if self._browser is not None:
+                self._browser.close()
+        except Exception as e:
+            log.warning(f"Browser pool: fermeture navigateur: {e}")
+        try:
+            if self._pw is not None:
+                self._pw.stop()
+        except Exception as e:
+            log.warning(f"Browser pool: arrêt Playwright: {e}")
+        self._browser = None
+        self._pw = None
+
+
+_pool = BrowserPool()
+
+
+def run(fn: Callable[[Any], Any]) -> Any:
+    return _pool.run(fn)
+
+
+def shutdown():
+    _pool.shutdown()
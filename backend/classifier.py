@@ -0,0 +1,115 @@
+"""
+Tri des intitulés de poste : PNT (pilote) ou non.
+Règles communes à toutes les sources (INCLUDE / EXCLUDE) + ajouts par source
+(OVERRIDES : types avion, mots allemands ou norvégiens, pages « recrutement »…).
+Chaque jeu de règles est compilé en une seule regex à groupes nommés, en
+lookahead pour voir aussi les termes qui se chevauchent (« chief pilot ») :
+un passage par titre.
+Un titre est retenu s'il contient un terme inclus et aucun terme exclu.
+Corpus étiqueté et mesure : python -m bench.classifier
+"""
+import hashlib
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+INCLUDE = (
+    r"pilots?", r"pilotes?", r"co-?pilote?s?", r"captains?", r"capitaines?", r"kapit[äa]ns?",
+    r"commandants?", r"commanders?", r"first officers?", r"second officers?", r"f/o",
+    r"flight crew", r"flight deck", r"pnt", r"cdb", r"opl",
+)
+EXCLUDE = (
+    r"cabin", r"attendants?", r"stewards?", r"stewardess(?:es)?", r"h[ôo]tesses?", r"pnc",
+    r"maintenance", r"engineers?", r"technicians?", r"techniciens?", r"mechanics?",
+    r"managers?", r"management", r"directors?", r"head of", r"recruiters?", r"sales",
+    r"dispatch(?:ers?)?", r"accountants?", r"interns?", r"internship",
+)
+
+
+class Rules(NamedTuple):
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+
+
+_BAMBOOHR = Rules(exclude=(r"ground", r"instructors?"))
+_ABBREVIATIONS = Rules(include=(r"cps?", r"fos?"))   # CP / FO dans les titres britanniques et danois
+
+# Termes ajoutés aux règles communes, par nom de source (registry)
+OVERRIDES: dict[str, Rules] = {
+    "Jetfly": _BAMBOOHR,
+    "Comlux": _BAMBOOHR,
+    "Luxaviation": _BAMBOOHR,
+    "Amelia": Rules(include=(r"officiers?",)),
+    "NetJets Europe": Rules(include=(r"second in command", r"pic", r"sic")),
+    "Chalair": Rules(exclude=(r"candidature[- ]spontan[ée]e",)),
+    "Oyonnair": Rules(exclude=(r"régulièrement", r"rejoignez-nous", r"recrutements?",
+                               r"domaines", r"tels que")),
+    "Helvetic Airways": Rules(include=(r"crew",), exclude=(r"backoffice", r"cadets?")),
+    "Elit'Avia": Rules(exclude=(r"travel", r"operations officer", r"nominated person")),
+    "Avcon Jet": Rules(exclude=(r"controlling", r"coordinators?", r"specialists?", r"lead")),
+    "Flying Group": Rules(exclude=(r"fuelers?", r"desk", r"drivers?", r"chauffeurs?", r"occ",
+                                   r"airworthiness", r"finance", r"marketing", r"hr", r"accounting")),
+    "Air Alliance": Rules(exclude=(r"arzt", r"ärztin", r"medizin\w*", r"elektroniker", r"mechaniker",
+                                   r"compliance", r"initiativ\w*")),
+    "Danish Air Transport": Rules(_ABBREVIATIONS.include, (r"mcc", r"chief pilot")),
+    "Loganair": Rules(_ABBREVIATIONS.include, (r"finance", r"accounts?")),
+    "VistaJet": Rules(include=(r"tri", r"tre", r"type rating"), exclude=(r"host",)),
+    "Luxair": Rules(exclude=(r"stage", r"summer", r"apprenti(?:e|s|ssage)?")),
+    "Platoon Aviation": Rules(include=(r"ab.initio",), exclude=(r"controllers?", r"camo")),
+    "Gama Aviation": Rules(exclude=(r"trainers?", r"instructors?")),
+    "Widerøe": Rules(exclude=(r"ekspedit\w*", r"arbeider\w*")),
+    "Spreeflug": Rules(exclude=(r"administrative", r"commercial")),
+    "GlobeAir": Rules(exclude=(r"logistics", r"procurement", r"marketing", r"buchhalter\w*")),
+    "DAS Private Jets": Rules(include=(r"kopilot(?:en|s)?", r"phenom", r"embraer", r"emb\d+"),
+                              exclude=(r"verkauf", r"studium", r"ausbildung", r"kaufmann",
+                                       r"kauffrau", r"b[üu]ro")),
+    "GlobalJet": Rules(include=(r"g650", r"g550", r"g7500", r"global\s*6000", r"falcon",
+                                r"pc-?24", r"a320", r"acj", r"embraer"),
+                       exclude=(r"reservations?", r"purchasing", r"coordinators?", r"support")),
+    "Air Corsica": Rules(include=(r"a320", r"atr"),
+                         exclude=(r"escale", r"commercial", r"vente", r"comptable", r"informatique",
+                                  r"rh", r"ressources humaines")),
+}
+# Change dès qu'un terme change : page_cache l'inclut dans sa clé (offres déjà filtrées)
+RULES_HASH = hashlib.sha256(repr((INCLUDE, EXCLUDE, sorted(OVERRIDES.items()))).encode()).hexdigest()[:12]
+
+
+class Classifier:
+    def __init__(self, rules: Rules):
+        self.rules = rules
+        terms = rules.include + rules.exclude
+        # Titres passés en minuscules : plus rapide que re.IGNORECASE. Seules les positions
+        # qui commencent un mot par une initiale de terme sont essayées ; à chacune,
+        # l'exclusion passe avant l'inclusion
+        initials = "".join(sorted({t[0] for t in terms}))
+        guard = f"(?=[{initials}])" if initials.isalnum() else ""
+        self.pattern = re.compile(
+            rf"\b{guard}(?=(?:(?P<exclude>{'|'.join(rules.exclude)})|(?P<include>{'|'.join(rules.include)}))\b)"
+        )
+
+    def scan(self, text: str) -> tuple[bool, bool]:
+        """(an include term matched, an exclude term matched) in `text`."""
+        included = excluded = False
+        for m in self.pattern.finditer(text.lower()):
+            if m.lastgroup == "exclude":
+                excluded = True
+            else:
+                included = True
+            if included and excluded:
+                break
+        return included, excluded
+
+    def is_pilot(self, title: str) -> bool:
+        low = title.lower()
+        m = self.pattern.search(low)
+        if m is None or m.lastgroup == "exclude":
+            return False
+        # Premier terme trouvé inclus : reste à vérifier qu'aucune exclusion ne suit
+        return not any(exclude for exclude, _ in self.pattern.findall(low, m.start()))
+
+
+@lru_cache(maxsize=None)
+def for_source(source: str) -> Classifier:
+    """Classifier with the common rules plus the source's OVERRIDES."""
+    extra = OVERRIDES.get(source, Rules())
+    return Classifier(Rules(INCLUDE + extra.include, EXCLUDE + extra.exclude))
@@ -0,0 +1,35 @@
+"""
+Accès SQLite depuis les endpoints async : les lectures tournent sur un pool de
+threads dédié et borné (DB_READ_WORKERS), chacun avec sa connexion WAL
+persistante (storage.connect). Les rares écritures de l'API (file des scans)
+passent par un thread à part : SQLite n'a qu'un écrivain, et une écriture qui
+attend le verrou n'occupe pas un thread de lecture. La boucle asyncio n'est
+jamais bloquée, et le threadpool de Starlette reste libre pour le reste.
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+READ_WORKERS = int(os.getenv("DB_READ_WORKERS", "4"))
+
+_reads = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="db-read")
+_writes = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+
+
+async def read(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking storage read on the DB pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_reads, functools.partial(fn, *args, **kwargs))
+
+
+async def write(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking storage write on the single writer thread and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_writes, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown():
+    _reads.shutdown(wait=False, cancel_futures=True)
+    _writes.shutdown(wait=True)   # une demande de scan acceptée doit être enregistrée
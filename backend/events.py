@@ -0,0 +1,143 @@
+"""
+Pub/sub en mémoire pour le flux SSE /api/events.
+Les threads du scanner appellent publish() : l'événement est remis à la boucle
+asyncio de chaque abonné via call_soon_threadsafe, sans jamais attendre. Chaque
+abonné a une file bornée (EVENTS_QUEUE_SIZE) : un client trop lent perd les
+événements les plus anciens plutôt que de ralentir le scan.
+
+Le scanner tourne dans un process à part (python -m scanner worker) : il y
+active relay(), qui écrit les événements par lots dans la table events ; le
+process API lance bridge(), qui relit cette table et republie localement.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+log = logging.getLogger(__name__)
+
+QUEUE_SIZE    = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+POLL_SECONDS  = float(os.getenv("EVENTS_POLL_SECONDS", "1"))
+RETENTION_SECONDS = 3600
+PRUNE_SECONDS = 60
+
+_lock = threading.Lock()
+_subscribers: set["Subscription"] = set()
+_ids = itertools.count(1)
+_outbox: queue.SimpleQueue | None = None   # non nul côté worker : événements à écrire en base
+
+
+class Subscription:
+    def __init__(self, maxsize: int = QUEUE_SIZE):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def _deliver(self, event: dict):
+        # Exécuté dans la boucle de l'abonné
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> dict | None:
+        """Next event, or None if nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+def subscribe() -> Subscription:
+    """Register a subscriber on the running event loop (call from async code)."""
+    sub = Subscription()
+    with _lock:
+        _subscribers.add(sub)
+    return sub
+
+
+def unsubscribe(sub: Subscription):
+    with _lock:
+        _subscribers.discard(sub)
+
+
+def publish(type_: str, **data: Any):
+    """Broadcast an event to every subscriber. Safe from any thread, never blocks."""
+    if _outbox is not None:
+        _outbox.put((type_, json.dumps(data, ensure_ascii=False)))
+    _deliver(type_, data)
+
+
+def _deliver(type_: str, data: dict):
+    event = {"id": next(_ids), "type": type_, "data": data}
+    with _lock:
+        subs = list(_subscribers)
+    for sub in subs:
+        try:
+            sub.loop.call_soon_threadsafe(sub._deliver, event)
+        except RuntimeError:   # boucle fermée (arrêt du serveur)
+            unsubscribe(sub)
+
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+
+
+def relay(stop: threading.Event):
+    """Worker side: persist published events in batches until `stop` is set."""
+    import storage
+
+    global _outbox
+    _outbox = queue.SimpleQueue()
+
+    def loop():
+        pruned_at = time.monotonic()
+        while True:
+            stopping = stop.wait(POLL_SECONDS / 2)
+            batch = []
+            while not _outbox.empty():
+                batch.append(_outbox.get_nowait())
+            if batch:
+                try:
+                    storage.append_events(batch)
+                except Exception as e:
+                    log.warning(f"Événements: écriture de {len(batch)} événement(s) en échec: {e}")
+            if stopping:
+                return
+            if time.monotonic() - pruned_at >= PRUNE_SECONDS:
+                pruned_at = time.monotonic()
+                try:
+                    storage.prune_events(RETENTION_SECONDS)
+                except Exception as e:
+                    log.warning(f"Événements: purge en échec: {e}")
+
+    threading.Thread(target=loop, name="events-relay", daemon=True).start()
+
+
+def bridge(stop: threading.Event, on_events: Callable[[], None] | None = None):
+    """API side: republish events written by the scanner worker until `stop` is set.
+    `on_events` runs after each non-empty batch (the API invalidates its response cache)."""
+    import storage
+
+    def loop():
+        last_id = None   # au démarrage : dernier événement en base, sans rejouer l'historique
+        while True:
+            rows = []
+            try:
+                if last_id is None:
+                    last_id = storage.last_event_id()
+                rows = storage.get_events_after(last_id)
+            except Exception as e:
+                log.warning(f"Événements: lecture en échec: {e}")
+            for row in rows:
+                _deliver(row["type"], json.loads(row["data"]))
+                last_id = row["id"]
+            if rows and on_events:
+                on_events()
+            if stop.wait(POLL_SECONDS):
+                return
+
+    threading.Thread(target=loop, name="events-bridge", daemon=True).start()
@@ -1,12 +1,28 @@
-import os
-import sqlite3
+import atexit
 import logging
+import mmap
+import os
+import re
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+import events
+from storage import get_pending_locations, load_geocache, resolve_pending_locations, save_geocache
 
 log = logging.getLogger(__name__)
 
-DB_FILE = os.getenv("DB_FILE", "wingjobs.db")
 FALLBACK = (48.5, 10.0)
 
+# Lieu introuvable : pas de nouvel essai avant GEOCACHE_MISS_TTL_HOURS ; erreur réseau : 1 h (backfill)
+MISS_TTL_SECONDS  = float(os.getenv("GEOCACHE_MISS_TTL_HOURS", "168")) * 3600
+ERROR_TTL_SECONDS = 3600
+FLUSH_SIZE    = 32
+FLUSH_SECONDS = 5.0
+BACKFILL_BATCH = int(os.getenv("GEOCODE_BATCH", "20"))   # lieux par lot du worker (Nominatim : 1/s)
+
 KNOWN_COORDS: dict[str, tuple[float, float]] = {
     # France
     "paris cdg": (49.0097, 2.5478),
@@ -130,59 +146,310 @@ KNOWN_COORDS: dict[str, tuple[float, float]] = {
     "n/c": (48.5, 10.0),
 }
 
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """Regex of a word list factored by common prefix ("paris(?: (?:cdg|orly))?"):
+    the engine walks one branch per character instead of trying every word."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Quantificateur gourmand : la branche la plus longue est essayée en premier
+        return f"(?:{body})?" if end else body
+
+    return build(trie)
+
+
+# Clés comparées en minuscules ; une clé par position dans la chaîne, lookahead
+# pour trouver aussi les correspondances qui se chevauchent
+_KNOWN = {key.lower(): coords for key, coords in KNOWN_COORDS.items()}
+_KNOWN_RE = re.compile(rf"(?=\b({_trie_pattern(list(_KNOWN))})\b)")   # mots entiers : « venice » ≠ nice
+
+
+@lru_cache(maxsize=4096)
+def match_known(loc_low: str) -> tuple[float, float] | None:
+    """Coordinates of the longest KNOWN_COORDS key found in `loc_low`
+    (leftmost on a tie): "paris le bourget" → le bourget, not paris."""
+    best = max((m.group(1) for m in _KNOWN_RE.finditer(loc_low)), key=len, default=None)
+    return _KNOWN[best] if best else None
+
+
+# ── Gazetteer hors ligne (data/gazetteer.tsv) ────────────────────────────────
+# Une ligne par clé : clé \t lat \t lon \t nom, triées par octets (LC_ALL=C sort).
+# Clés : noms de villes / pays / aéroports passés par normalize(), et codes
+# OACI / IATA en majuscules (LFPB, LBG). Le fichier est mappé en mémoire et
+# interrogé par dichotomie : ni chargement au démarrage, ni réseau.
+
+GAZETTEER_FILE = Path(__file__).parent / "data" / "gazetteer.tsv"
+
+_FOLD = str.maketrans({"ø": "o", "æ": "ae", "œ": "oe", "ł": "l", "đ": "d", "ı": "i", "þ": "th", "ð": "d"})
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+_SEGMENT = re.compile(r"[,;/()\[\]|]| [-–] ")
+_CODE = re.compile(r"\b[A-Z]{3,4}\b")
+_PAREN_CODE = re.compile(r"\(([A-Z]{3,4})\)")
+PREFIX_MIN_LEN = 5
+
+
+def normalize(text: str) -> str:
+    """Casefolded, accents stripped, punctuation collapsed: "Zürich-Kloten" → "zurich kloten"."""
+    text = unicodedata.normalize("NFKD", text.casefold().translate(_FOLD))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", text).strip()
+
+
+class _Gazetteer:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: mmap.mmap | bytes | None = None
+
+    def _map(self) -> mmap.mmap | bytes:
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    try:
+                        with open(self.path, "rb") as f:
+                            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    except (OSError, ValueError) as e:   # absent ou vide
+                        log.warning(f"Gazetteer indisponible ({self.path}): {e}")
+                        self._data = b""
+        return self._data
+
+    def _line(self, key: bytes) -> bytes:
+        """First line whose key is >= `key` (b"" past the end)."""
+        data = self._map()
+        lo, hi = 0, len(data)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = data.rfind(b"\n", 0, mid) + 1
+            end = data.find(b"\n", start)
+            end = len(data) if end < 0 else end
+            if data[start:data.find(b"\t", start, end)] < key:
+                lo = end + 1
+            else:
+                hi = start
+        end = data.find(b"\n", lo)
+        return data[lo:len(data) if end < 0 else end]
+
+    def get(self, key: str, prefix: bool = False) -> tuple[float, float] | None:
+        """Exact key, or with `prefix` the first key extending it by whole words
+        ("frankfurt" → "frankfurt am main")."""
+        wanted = key.encode()
+        fields = self._line(wanted).split(b"\t")
+        if len(fields) < 3:
+            return None
+        if fields[0] == wanted or (prefix and fields[0].startswith(wanted + b" ")):
+            return float(fields[1]), float(fields[2])
+        return None
+
+
+_gazetteer = _Gazetteer(GAZETTEER_FILE)
+
+
+@lru_cache(maxsize=4096)
+def gazetteer_lookup(location: str) -> tuple[float, float] | None:
+    """Resolve a free-form location offline.
+    1. an OACI / IATA code in parentheses ("Paris-Le Bourget (LFPB)");
+    2. the whole string, then each comma / parenthesis segment, trimmed word by
+       word from the right ("Zurich Airport, Kloten" → "zurich airport");
+    3. other codes written in capitals ("LFPB", "Geneva GVA") — after the names,
+       so an ISO country code ("Ajaccio, FRA") isn't read as an airport;
+    4. a segment as the word prefix of a longer name."""
+    for code in _PAREN_CODE.findall(location):
+        coords = _gazetteer.get(code)
+        if coords:
+            return coords
+
+    segments = [normalize(location)] + [normalize(s) for s in _SEGMENT.split(location)]
+    segments = [s for s in dict.fromkeys(segments) if s]
+    for segment in segments:
+        words = segment.split()
+        for k in range(len(words), 0, -1):
+            coords = _gazetteer.get(" ".join(words[:k]))
+            if coords:
+                return coords
+
+    # Tout en capitales (« ISLE OF MAN ») : des mots, pas des codes
+    if not location.isupper() or " " not in location.strip():
+        for code in _CODE.findall(location):
+            coords = _gazetteer.get(code)
+            if coords:
+                return coords
+
+    for segment in segments:
+        if len(segment) >= PREFIX_MIN_LEN:
+            coords = _gazetteer.get(segment, prefix=True)
+            if coords:
+                return coords
+    return None
+
+
 try:
     import ssl, certifi
     from geopy.geocoders import Nominatim
     from geopy.extra.rate_limiter import RateLimiter
     _ssl_ctx = ssl.create_default_context(cafile=certifi.where())
     _geolocator = Nominatim(user_agent="wingjobs/1.0", ssl_context=_ssl_ctx)
-    _geocode = RateLimiter(_geolocator.geocode, min_delay_seconds=1)
+    _geocode = RateLimiter(_geolocator.geocode, min_delay_seconds=1, swallow_exceptions=False)
     GEOPY_AVAILABLE = True
 except ImportError:
     GEOPY_AVAILABLE = False
 
 
 def _nominatim_lookup(location: str) -> tuple[float, float] | None:
-    if not GEOPY_AVAILABLE:
-        return None
-    try:
-        result = _geocode(location)
-        if result:
-            return result.latitude, result.longitude
-    except Exception as e:
-        log.warning(f"Nominatim error for '{location}': {e}")
-    return None
+    """Nominatim result, None if not found. Network / service errors propagate once
+    RateLimiter's retries are exhausted (swallow_exceptions=False)."""
+    result = _geocode(location)
+    return (result.latitude, result.longitude) if result else None
+
+
+class _GeoCache:
+    """geocache / geocache_miss tables held in memory, loaded on first use.
+    New entries are written back in batches (FLUSH_SIZE entries or FLUSH_SECONDS)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits: dict[str, tuple[float, float]] | None = None
+        self._misses: dict[str, float] = {}          # location → expires_at (epoch)
+        self._pending_hits: list[tuple[str, float, float]] = []
+        self._pending_misses: list[tuple[str, float]] = []
+        self._flushed_at = time.monotonic()
+
+    def _load(self):
+        if self._hits is None:
+            self._hits, self._misses = load_geocache()
+
+    def get(self, loc_low: str) -> tuple[bool, tuple[float, float] | None]:
+        """(known, coords): known=False means Nominatim must be asked."""
+        with self._lock:
+            self._load()
+            if loc_low in self._hits:
+                return True, self._hits[loc_low]
+            expires = self._misses.get(loc_low)
+            if expires and expires > time.time():
+                return True, None
+            return False, None
+
+    def put(self, loc_low: str, coords: tuple[float, float] | None, ttl_seconds: float = 0):
+        with self._lock:
+            self._load()
+            if coords:
+                self._hits[loc_low] = coords
+                self._misses.pop(loc_low, None)
+                self._pending_hits.append((loc_low, *coords))
+            else:
+                self._misses[loc_low] = time.time() + ttl_seconds
+                self._pending_misses.append((loc_low, self._misses[loc_low]))
+            due = (len(self._pending_hits) + len(self._pending_misses) >= FLUSH_SIZE
+                   or time.monotonic() - self._flushed_at >= FLUSH_SECONDS)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            hits, misses = self._pending_hits, self._pending_misses
+            self._pending_hits, self._pending_misses = [], []
+            self._flushed_at = time.monotonic()
+        if not (hits or misses):
+            return
+        try:
+            save_geocache(hits, misses)
+        except Exception as e:   # le cache mémoire reste bon ; on retentera au prochain lot
+            log.warning(f"Geocache: écriture de {len(hits) + len(misses)} entrée(s) en échec: {e}")
+            with self._lock:
+                self._pending_hits[:0], self._pending_misses[:0] = hits, misses
+
+
+_cache = _GeoCache()
+atexit.register(_cache.flush)
+
+
+def flush():
+    """Write pending geocache entries now (end of a scan)."""
+    _cache.flush()
+
+
+def resolve_local(location: str) -> tuple[bool, tuple[float, float] | None]:
+    """(known, coords) without any network call: known=False means only Nominatim can tell."""
+    loc_clean = location.strip()
+    loc_low = loc_clean.lower()
+
+    # 1. Static dict (fast path)
+    coords = match_known(loc_low)
+    if coords:
+        return True, coords
+
+    # 2. Gazetteer hors ligne (villes, pays, aéroports et codes OACI / IATA)
+    coords = gazetteer_lookup(loc_clean)
+    if coords:
+        return True, coords
+
+    # 3. Geocache en mémoire (succès, et échecs récents : pas de nouvel appel Nominatim)
+    return _cache.get(loc_low)
 
 
 def get_coords(location: str) -> tuple[float, float]:
+    """Coordinates known locally, FALLBACK otherwise. Never calls Nominatim: the
+    scanner marks such jobs geo_pending and the worker resolves them (backfill)."""
     if not location:
         return FALLBACK
+    known, coords = resolve_local(location)
+    return coords or FALLBACK
+
+
+def needs_lookup(location: str) -> bool:
+    """True if only a Nominatim call can place `location`."""
+    return bool(location and location.strip()) and GEOPY_AVAILABLE and not resolve_local(location)[0]
 
+
+def lookup_remote(location: str) -> tuple[bool, tuple[float, float] | None]:
+    """(known, coords) from Nominatim (rate-limited); answers, misses included, are
+    cached. known=False on a network / service error: nothing is cached."""
     loc_clean = location.strip()
-    loc_low = loc_clean.lower()
+    try:
+        coords = _nominatim_lookup(loc_clean)
+    except Exception as e:
+        log.warning(f"Nominatim error for '{location}': {e}")
+        return False, None
+    _cache.put(loc_clean.lower(), coords, MISS_TTL_SECONDS)
+    return True, coords
 
-    # 1. Static dict (fast path)
-    for key, coords in KNOWN_COORDS.items():
-        if key in loc_low:
-            return coords
 
-    # 2. SQLite geocache
-    with sqlite3.connect(DB_FILE) as conn:
-        row = conn.execute(
-            "SELECT lat, lon FROM geocache WHERE LOWER(location) = ?", (loc_low,)
-        ).fetchone()
-        if row:
-            return row[0], row[1]
+_retry_at: dict[str, float] = {}   # lieu en erreur Nominatim → prochain essai (epoch)
 
-    # 3. Nominatim (rate-limited, result cached)
-    coords = _nominatim_lookup(loc_clean)
-    if coords:
-        lat, lon = coords
-        with sqlite3.connect(DB_FILE) as conn:
-            conn.execute(
-                "INSERT OR IGNORE INTO geocache (location, lat, lon) VALUES (?, ?, ?)",
-                (loc_low, lat, lon),
-            )
-        return lat, lon
-
-    return FALLBACK
+
+def backfill(batch: int = BACKFILL_BATCH) -> int:
+    """Geocode up to `batch` distinct locations of geo_pending jobs and update those
+    jobs in place. A location Nominatim fails on stays pending and is retried after
+    ERROR_TTL_SECONDS. Returns the number of locations resolved, 0 when nothing is
+    pending or Nominatim is failing (the worker then waits for its next poll)."""
+    now = time.time()
+    for location in [loc for loc, at in _retry_at.items() if at <= now]:
+        del _retry_at[location]
+    locations = get_pending_locations(batch, exclude=list(_retry_at))
+    resolved, failed = [], False
+    for location in locations:
+        known, coords = resolve_local(location)   # déjà résolu par un lot précédent ou un doublon
+        if not known and GEOPY_AVAILABLE:
+            known, coords = lookup_remote(location)
+            if not known:
+                _retry_at[location] = time.time() + ERROR_TTL_SECONDS
+                failed = True
+                break
+        resolved.append((location, *(coords or FALLBACK)))
+    if resolved:
+        jobs = resolve_pending_locations(resolved)
+        flush()
+        events.publish("geo_resolved", locations=len(resolved), jobs=jobs)
+        log.info(f"Géocodage: {len(resolved)} lieu(x), {jobs} offre(s) mise(s) à jour")
+    return 0 if failed else len(resolved)
@@ -0,0 +1,79 @@
+"""
+Client HTTP partagé par tous les scrapers.
+Une seule Session requests : pool keep-alive par host (plus de handshake TLS à
+chaque requête), en-têtes et timeout par défaut, compteurs octets/latence.
+"""
+import logging
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 15
+POOL_HOSTS = 64
+POOL_SIZE  = int(os.getenv("HTTP_POOL_SIZE", "4"))
+
+try:
+    import brotli  # noqa: F401 — urllib3 ne décode "br" que si le module est présent
+    _ENCODINGS = "gzip, deflate, br"
+except ImportError:
+    _ENCODINGS = "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": _ENCODINGS,
+}
+
+_adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE)
+_stats: dict[str, dict] = {}
+_stats_lock = threading.Lock()
+
+
+class _Session(requests.Session):
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        return super().request(method, url, **kwargs)
+
+
+def _record(r: requests.Response, *args, **kwargs):
+    body = r.content
+    wire = r.raw.tell() if hasattr(r.raw, "tell") else len(body)
+    ms = r.elapsed.total_seconds() * 1000
+    host = urlsplit(r.url).hostname or "?"
+    with _stats_lock:
+        s = _stats.setdefault(host, {"requests": 0, "bytes": 0, "latency_ms": 0.0})
+        s["requests"] += 1
+        s["bytes"] += wire
+        s["latency_ms"] += ms
+    log.debug(f"{r.request.method} {r.url} → {r.status_code} {wire}o {ms:.0f}ms")
+
+
+def new_session() -> requests.Session:
+    """Session with its own cookie jar, sharing the global connection pool."""
+    s = _Session()
+    s.headers.update(DEFAULT_HEADERS)
+    s.mount("https://", _adapter)
+    s.mount("http://", _adapter)
+    s.hooks["response"].append(_record)
+    return s
+
+
+_session = new_session()
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return _session.get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return _session.post(url, **kwargs)
+
+
+def stats() -> dict[str, dict]:
+    """Per-host counters: requests, bytes received on the wire, cumulated latency."""
+    with _stats_lock:
+        return {host: dict(s) for host, s in _stats.items()}
@@ -0,0 +1,73 @@
+"""
+Élection d'un seul process scanner quand plusieurs workers (python -m scanner
+worker) tournent sur le même hôte et la même base SQLite.
+Chaque process tente de prendre un bail (table leases) ; le détenteur le
+renouvelle toutes les SCAN_LEASE_TTL_SECONDS / 3. S'il meurt ou se fige, le
+bail expire et un autre worker le reprend au heartbeat suivant.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Callable
+
+from storage import acquire_lease, release_lease
+
+log = logging.getLogger(__name__)
+
+TTL_SECONDS = float(os.getenv("SCAN_LEASE_TTL_SECONDS", "60"))
+
+
+class Lease:
+    def __init__(self, name: str, ttl_seconds: float = TTL_SECONDS,
+                 on_acquire: Callable[[], None] | None = None):
+        self.name = name
+        self.ttl = ttl_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.on_acquire = on_acquire
+        self._held = False
+        self._renewed_at = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._held
+
+    def start(self):
+        self._beat()
+        self._thread = threading.Thread(target=self._loop, name=f"lease-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._held:
+            release_lease(self.name, self.holder)
+            self._held = False
+
+    def _loop(self):
+        while not self._stop.wait(self.ttl / 3):
+            self._beat()
+
+    def _beat(self):
+        try:
+            held = acquire_lease(self.name, self.holder, self.ttl)
+        except Exception as e:
+            log.warning(f"Bail {self.name}: heartbeat en échec: {e}")
+            # Le bail en base reste le nôtre jusqu'à son expiration
+            held = self._held and time.monotonic() - self._renewed_at < self.ttl
+        else:
+            if held:
+                self._renewed_at = time.monotonic()
+        if held and not self._held:
+            log.info(f"Bail {self.name} acquis par {self.holder}")
+            self._held = True
+            if self.on_acquire:
+                threading.Thread(target=self.on_acquire, daemon=True).start()
+        elif not held and self._held:
+            log.warning(f"Bail {self.name} perdu par {self.holder}")
+            self._held = False
@@ -1,18 +1,23 @@
 import logging
 import os
 import threading
+import uuid
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Literal
 
-from fastapi import FastAPI, BackgroundTasks, Header, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from apscheduler.schedulers.background import BackgroundScheduler
+from pydantic import BaseModel
 from dotenv import load_dotenv
 
+import db_executor
+import events
+import response_cache
 import storage
-import scanner
+from scrapers.registry import select_sources
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s — %(message)s")
@@ -22,21 +27,16 @@ log = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     storage.init_db()
-    sched = BackgroundScheduler()
-    sched.add_job(
-        scanner.run_scan,
-        "interval",
-        hours=scanner.CHECK_INTERVAL_HOURS,
-        id="auto_scan",
-    )
-    sched.start()
-    t = threading.Thread(target=scanner.run_scan, daemon=True)
-    t.start()
+    # Écritures du worker scanner : relayées par la table events
+    stop = threading.Event()
+    events.bridge(stop, on_events=response_cache.bump)
     yield
-    sched.shutdown(wait=False)
+    stop.set()
+    db_executor.shutdown()
 
 
 SCAN_API_KEY = os.getenv("SCAN_API_KEY", "")
+SSE_KEEPALIVE_SECONDS = 15
 
 app = FastAPI(title="WingJobs", lifespan=lifespan, docs_url=None, redoc_url=None)
 
@@ -49,53 +49,118 @@ app.add_middleware(
 
 
 @app.get("/api/jobs")
-def get_jobs(source: str = None, status: str = None, q: str = None):
-    jobs = storage.get_jobs(source=source, status=status, q=q)
-    stats = storage.get_stats()
-    return {
-        "jobs": jobs,
-        "total": len(jobs),
-        "last_scan": storage.get_meta("last_scan"),
-        "next_scan": storage.get_meta("next_scan"),
-        "scan_running": scanner.is_running(),
-        **stats,
-    }
+async def get_jobs(request: Request, source: str = None, status: str = None, q: str = None,
+                   sort: Literal["recent", "oldest", "relevance"] = "recent",
+                   cursor: str = None, limit: int = Query(default=200, ge=1, le=1000),
+                   fields: str = None):
+    def build():
+        # Lu avant la page : un changement concurrent sera revu via /api/jobs/changes, pas perdu
+        changes_cursor = storage.changes_head()
+        try:
+            jobs, next_cursor = storage.get_jobs_page(
+                source=source, status=status, q=q, sort=sort, cursor=cursor, limit=limit,
+                fields=fields.split(",") if fields else None,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        stats = storage.get_stats()
+        return {
+            "jobs": jobs,
+            "next_cursor": next_cursor,
+            "changes_cursor": changes_cursor,
+            "matched": storage.count_jobs(source=source, status=status, q=q),
+            "last_scan": storage.get_meta("last_scan"),
+            "next_scan": storage.get_meta("next_scan"),
+            "scan_running": storage.scan_running(),
+            **stats,
+        }
+    return await response_cache.respond(request, build)
+
+
+@app.get("/api/jobs/changes")
+async def get_job_changes(request: Request, since: str = None,
+                          limit: int = Query(default=500, ge=1, le=5000), fields: str = None):
+    def build():
+        try:
+            jobs, cursor, more = storage.get_job_changes(
+                since, limit, fields.split(",") if fields else None)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"jobs": jobs, "cursor": cursor, "more": more, **storage.get_stats()}
+    return await response_cache.respond(request, build)
 
 
 @app.get("/api/sources")
-def get_sources():
-    return {"sources": storage.get_sources()}
+async def get_sources(request: Request):
+    return await response_cache.respond(request, lambda: {"sources": storage.get_sources()})
 
 
 @app.get("/api/status")
-def get_status():
-    stats = storage.get_stats()
-    return {
-        **stats,
-        "last_scan": storage.get_meta("last_scan"),
-        "next_scan": storage.get_meta("next_scan"),
-        "scan_running": scanner.is_running(),
-    }
+async def get_status(request: Request):
+    def build():
+        stats = storage.get_stats()
+        return {
+            **stats,
+            "last_scan": storage.get_meta("last_scan"),
+            "next_scan": storage.get_meta("next_scan"),
+            "scan_running": storage.scan_running(),
+        }
+    return await response_cache.respond(request, build)
+
+
+class ScanRequest(BaseModel):
+    sources: list[str] | None = None   # noms de sources, ex. ["Chalair", "VistaJet"]
+    family: str | None = None          # bamboohr | recruitee | custom
 
 
 @app.post("/api/scan")
-def trigger_scan(background_tasks: BackgroundTasks, x_scan_key: str = Header(default="")):
+async def trigger_scan(req: ScanRequest | None = None, x_scan_key: str = Header(default="")):
     if not SCAN_API_KEY or x_scan_key != SCAN_API_KEY:
         raise HTTPException(status_code=403, detail="Forbidden")
-    if scanner.is_running():
-        return {"message": "Scan déjà en cours", "status": "running"}
-    background_tasks.add_task(scanner.run_scan, False)
-    return {"message": "Scan lancé", "status": "started"}
+    req = req or ScanRequest()
+    try:
+        sources = [s.name for s in select_sources(req.sources, req.family)]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    scan_id = uuid.uuid4().hex[:12]
+    await db_executor.write(storage.enqueue_scan, scan_id, sources, bool(req.sources))
+    return {"message": "Scan demandé", "status": "queued", "scan_id": scan_id, "sources": sources}
+
+
+@app.get("/api/scan/{scan_id}")
+async def get_scan(scan_id: str):
+    scan = await db_executor.read(storage.get_scan, scan_id)
+    if scan is None:
+        raise HTTPException(status_code=404, detail="Scan inconnu")
+    return scan
 
 
 @app.get("/api/scanner")
-def get_scanner_status():
-    return {
+async def get_scanner_status(request: Request):
+    return await response_cache.respond(request, lambda: {
         "sources": storage.get_source_statuses(),
         "last_scan": storage.get_meta("last_scan"),
         "next_scan": storage.get_meta("next_scan"),
-        "scan_running": scanner.is_running(),
-    }
+        "scan_running": storage.scan_running(),
+    })
+
+
+@app.get("/api/events")
+async def stream_events(request: Request):
+    """Server-Sent Events: scan_start, source_start, source_done, job_new, scan_done."""
+    async def stream():
+        sub = events.subscribe()
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                event = await sub.get(timeout=SSE_KEEPALIVE_SECONDS)
+                # Commentaire SSE : garde la connexion ouverte à travers les proxies
+                yield events.format_sse(event) if event else ": keepalive\n\n"
+        finally:
+            events.unsubscribe(sub)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 DIST = Path(__file__).parent.parent / "frontend" / "dist"
@@ -105,7 +170,7 @@ if DIST.exists():
 
     @app.get("/", include_in_schema=False)
     @app.get("/{full_path:path}", include_in_schema=False)
-    def spa(full_path: str = ""):
+    async def spa(full_path: str = ""):
         if full_path.startswith("api"):
             return {"error": "not found"}
         return FileResponse(DIST / "index.html")
@@ -15,6 +15,7 @@ class JobOffer:
     first_seen: Optional[str] = None
     last_seen: Optional[str] = None
     notified: bool = False
+    geo_pending: bool = False   # lat/lon provisoires, lieu à géocoder en tâche de fond
 
     def to_dict(self) -> dict:
         return {
@@ -0,0 +1,89 @@
+"""
+Cache des pages carrières entre deux scans (table http_cache).
+fetch() fait un GET conditionnel (If-None-Match / If-Modified-Since) : si la
+page répond 304 ou si le hash du corps n'a pas changé, les offres extraites au
+scan précédent sont renvoyées telles quelles, sans parsing. Le scraper appelle
+store() une fois la page parsée pour mémoriser validateurs et résultats.
+Les entrées sont propres à une version des règles de tri (classifier.RULES_HASH) :
+une règle modifiée fait re-parser chaque page au scan suivant. Au-delà de
+PAGE_CACHE_MAX_AGE_HOURS, la page est re-parsée quoi qu'il arrive (changement
+du parsing côté scraper).
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+import requests
+
+import http_client
+from classifier import RULES_HASH
+from models import JobOffer
+from storage import get_http_cache, put_http_cache
+
+log = logging.getLogger(__name__)
+
+MAX_AGE_HOURS = int(os.getenv("PAGE_CACHE_MAX_AGE_HOURS", "168"))
+
+_counters = threading.local()
+
+
+def begin():
+    """Reset this thread's hit/check counters (called by the scanner before each source)."""
+    _counters.hits = 0
+    _counters.checks = 0
+
+
+def counters() -> tuple[int, int]:
+    return getattr(_counters, "hits", 0), getattr(_counters, "checks", 0)
+
+
+def _body_hash(r: requests.Response) -> str:
+    return hashlib.sha256(r.content).hexdigest()
+
+
+def _key(url: str) -> str:
+    return f"{url}#{RULES_HASH}"
+
+
+def fetch(url: str, **kwargs) -> tuple[requests.Response | None, list[JobOffer] | None]:
+    """Return (None, cached_jobs) when the page is unchanged, else (response, None)."""
+    entry = get_http_cache(_key(url))
+    if entry and datetime.now() - datetime.fromisoformat(entry["parsed_at"]) > timedelta(hours=MAX_AGE_HOURS):
+        entry = None
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    r = http_client.get(url, headers=headers, **kwargs)
+    _counters.checks = getattr(_counters, "checks", 0) + 1
+    if entry and r.status_code == 304:
+        return None, _hit(url, entry, "304")
+    r.raise_for_status()
+    if entry and _body_hash(r) == entry["body_hash"]:
+        return None, _hit(url, entry, "hash identique")
+    return r, None
+
+
+def _hit(url: str, entry: dict, why: str) -> list[JobOffer]:
+    _counters.hits = getattr(_counters, "hits", 0) + 1
+    jobs = [JobOffer(**d) for d in json.loads(entry["results"])]
+    log.info(f"{url}: page inchangée ({why}), {len(jobs)} offre(s) depuis le cache")
+    return jobs
+
+
+def store(url: str, r: requests.Response, jobs: list[JobOffer]):
+    put_http_cache(
+        _key(url),
+        r.headers.get("ETag"),
+        r.headers.get("Last-Modified"),
+        _body_hash(r),
+        json.dumps([asdict(j) for j in jobs]),
+    )
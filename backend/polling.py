@@ -0,0 +1,33 @@
+"""
+Politique de polling adaptative par source.
+L'intervalle d'une source se resserre quand elle bouge (offre nouvelle ou
+expirée) et s'allonge quand rien ne change, entre POLL_MIN_HOURS et
+POLL_MAX_HOURS. Une erreur ne modifie pas l'intervalle (il mesure le rythme de
+changement, pas la santé du site) mais rapproche la prochaine tentative :
+backoff exponentiel qui part de POLL_MIN_HOURS et reste plafonné à l'intervalle.
+"""
+import os
+import random
+from datetime import datetime, timedelta
+
+DEFAULT_MINUTES = int(float(os.getenv("POLL_DEFAULT_HOURS", "12")) * 60)
+MIN_MINUTES     = int(float(os.getenv("POLL_MIN_HOURS", "2")) * 60)
+MAX_MINUTES     = int(float(os.getenv("POLL_MAX_HOURS", "48")) * 60)
+
+SPEEDUP  = 0.5    # source qui a changé → on repasse deux fois plus vite
+SLOWDOWN = 1.25   # source stable → on espace progressivement
+JITTER   = 0.1    # ±10 % pour ne pas re-synchroniser toutes les sources
+
+
+def next_interval(interval_min: int | None, changed: bool) -> int:
+    current = interval_min or DEFAULT_MINUTES
+    factor = SPEEDUP if changed else SLOWDOWN
+    return max(MIN_MINUTES, min(MAX_MINUTES, int(current * factor)))
+
+
+def next_due(now: datetime, interval_min: int, fail_streak: int = 0) -> datetime:
+    delay = interval_min
+    if fail_streak:
+        delay = min(interval_min, MIN_MINUTES * 2 ** (fail_streak - 1))
+    delay *= 1 + random.uniform(-JITTER, JITTER)
+    return now + timedelta(minutes=delay)
@@ -0,0 +1,77 @@
+"""
+Cache des réponses des endpoints de lecture (/api/jobs, /api/sources, /api/status,
+/api/scanner). Les données ne bougent que quand le worker scanner écrit : le
+relais d'événements de l'API (events.bridge) incrémente un compteur de
+génération (bump) à chaque lot d'événements, et une réponse
+est réutilisée tant que chemin, paramètres et génération sont identiques
+(et au plus RESPONSE_CACHE_MAX_AGE secondes : new_48h dépend de l'heure).
+Chaque réponse porte un ETag fort (hash du corps) ; un client qui renvoie
+If-None-Match reçoit 304 sans corps.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from fastapi import Request, Response
+
+import db_executor
+
+MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+MAX_AGE     = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "300"))
+
+_lock = threading.Lock()
+_generation = 0
+_entries: OrderedDict[tuple, tuple[str, bytes]] = OrderedDict()
+
+
+def bump():
+    """Invalidate every cached response (events.bridge calls it after each batch)."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    return header.strip() == "*" or etag in (t.strip() for t in header.split(","))
+
+
+def _key(request: Request) -> tuple:
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())),
+            _generation, int(time.time() // MAX_AGE))
+
+
+def _render(key: tuple, build: Callable[[], Any]) -> tuple[str, bytes]:
+    body = json.dumps(build(), ensure_ascii=False, separators=(",", ":")).encode()
+    entry = (f'"{hashlib.sha256(body).hexdigest()[:32]}"', body)
+    with _lock:
+        # Une génération passée pendant build() : la réponse peut déjà être périmée
+        if key[2] == _generation:
+            _entries[key] = entry
+            while len(_entries) > MAX_ENTRIES:
+                _entries.popitem(last=False)
+    return entry
+
+
+async def respond(request: Request, build: Callable[[], Any]) -> Response:
+    """Serve `build()` as JSON through the cache; 304 if the client already has it.
+    A hit is answered on the event loop; a miss runs build() (SQLite) and the
+    serialisation on the DB read pool."""
+    key = _key(request)
+    with _lock:
+        entry = _entries.get(key)
+        if entry:
+            _entries.move_to_end(key)
+    if entry is None:
+        entry = await db_executor.read(_render, key, build)
+
+    etag, body = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
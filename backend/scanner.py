@@ -1,118 +1,276 @@
 import logging
+import os
+import sys
 import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
-from storage import upsert_job, expire_missing_jobs, set_meta, update_source_status
-from scrapers.ats import bamboohr, recruitee
-from scrapers.companies import amelia, netjets, la_compagnie, chalair, pan_europeenne, helvetic, elitavia, avconjet, flyinggroup, air_alliance, dat, loganair, jetaviation, vistajet, luxair, platoon, gamaaviation, wideroe, spreeflug, globeair, arcusair, dasprivatejets, globaljet, aircorsica
+import breaker
+import events
+import geocoder
+import polling
+from storage import (save_source_result, set_meta, update_source_status,
+                     update_source_schedule, get_source_schedule, get_next_due,
+                     set_circuit_state, record_scan, finish_scan, get_meta)
+from scrapers.registry import Source, all_sources
 from models import JobOffer
 
 log = logging.getLogger(__name__)
 
-CHECK_INTERVAL_HOURS = 12
+TICK_MINUTES  = int(os.getenv("SCHEDULER_TICK_MINUTES", "10"))
+SCAN_WORKERS  = int(os.getenv("SCAN_WORKERS", "8"))
+SCAN_PER_HOST = int(os.getenv("SCAN_PER_HOST", "1"))
 
-_scan_running = False
 _lock = threading.Lock()
+_active: set[str] = set()                      # sources en cours de scan, tous scans confondus
+_claimed: dict[str, list[Source]] = {}
+_host_slots: dict[str, threading.Semaphore] = {}
+holder: str | None = None   # leader.Lease.holder du worker
 
-BAMBOOHR_COMPANIES = [
-    ("jetfly",      "Jetfly",       "Luxembourg"),
-    ("comlux",      "Comlux",       "Luxembourg"),
-    ("luxaviation", "Luxaviation",  "Luxembourg"),
-]
-
-RECRUITEE_COMPANIES = [
-    ("dcaviationgmbh", "DC Aviation",  "Stuttgart"),
-    ("tagaviation3",   "TAG Aviation", "Geneva"),
-    ("astonjet",       "AstonJet",     "Paris Le Bourget"),
-]
-
-CUSTOM_SCRAPERS = [
-    ("Amelia",           amelia.scan),
-    ("NetJets Europe",   netjets.scan),  # via Cloudflare Worker (netjets-proxy.dumassimon22.workers.dev)
-    ("La Compagnie",     la_compagnie.scan),
-    ("Chalair",          chalair.scan),
-    ("Pan Européenne",   pan_europeenne.scan),
-    ("Helvetic Airways", helvetic.scan),
-    ("Elit'Avia",        elitavia.scan),
-    ("Avcon Jet",        avconjet.scan),
-    ("Flying Group",          flyinggroup.scan),
-    ("Air Alliance",          air_alliance.scan),
-    ("Danish Air Transport",  dat.scan),
-    ("Loganair",              loganair.scan),
-    ("Jet Aviation",          jetaviation.scan),
-    ("VistaJet",              vistajet.scan),
-    ("Luxair",                luxair.scan),
-    ("Platoon Aviation",      platoon.scan),
-    ("Gama Aviation",         gamaaviation.scan),
-    ("Widerøe",               wideroe.scan),
-    ("Spreeflug",             spreeflug.scan),
-    ("GlobeAir",              globeair.scan),
-    ("Arcus Air",             arcusair.scan),
-    ("DAS Private Jets",      dasprivatejets.scan),
-    ("GlobalJet",             globaljet.scan),
-    ("Air Corsica",           aircorsica.scan),
-]
-
-
-def is_running() -> bool:
-    return _scan_running
-
-
-def _run_source(name: str, results: list[JobOffer] | None, duration_ms: int) -> list[JobOffer]:
+
+def _run_source(name: str, results: list[JobOffer] | None, duration_ms: int,
+                cache: tuple[int, int] = (0, 0), schedule: dict | None = None) -> list[JobOffer]:
     """Upsert jobs, expire missing ones, record status, return list of new jobs."""
+    hits, checks = cache
     if results is None:
-        update_source_status(name, "error", 0, duration_ms, "Erreur réseau ou timeout")
+        update_source_status(name, "error", 0, duration_ms, "Erreur réseau ou timeout",
+                             cache_hits=hits, cache_checks=checks)
+        _reschedule(name, schedule, changed=False, failed=True)
+        events.publish("source_done", source=name, status="error", duration_ms=duration_ms,
+                       jobs_found=0, new_jobs=0, expired=0)
         log.warning(f"{name}: scan en erreur, expiry ignorée")
         return []
-    new: list[JobOffer] = []
-    seen_ids: set[str] = set()
     for job in results:
-        if upsert_job(job):
-            new.append(job)
-        seen_ids.add(job.id)
-    expire_missing_jobs(name, seen_ids)
-    update_source_status(name, "ok", len(results), duration_ms)
+        if (job.lat, job.lon) == geocoder.FALLBACK:
+            job.geo_pending = geocoder.needs_lookup(job.location)
+    new, expired = save_source_result(name, results, duration_ms,
+                                      cache_hits=hits, cache_checks=checks)
+    _reschedule(name, schedule, changed=bool(new or expired), failed=False)
+    for job in new:
+        events.publish("job_new", **job.to_dict())
+    events.publish("source_done", source=name, status="ok", duration_ms=duration_ms,
+                   jobs_found=len(results), new_jobs=len(new), expired=expired)
     return new
 
 
-def _timed_scan(name: str, fn, *args) -> tuple[list[JobOffer] | None, int]:
-    """Run a scraper function, return (results, duration_ms)."""
+def _reschedule(name: str, schedule: dict | None, changed: bool, failed: bool):
+    schedule = schedule or {}
+    now = datetime.now()
+    interval = schedule.get("poll_interval_min")
+    streak = (schedule.get("fail_streak") or 0) + 1 if failed else 0
+    if interval is None:
+        # Premier passage : tout est « nouveau », pas d'observation de rythme
+        interval = polling.DEFAULT_MINUTES
+    elif not failed:
+        interval = polling.next_interval(interval, changed)
+
+    due = polling.next_due(now, interval, streak)
+    state, until = breaker.CLOSED, None
+    reopen = breaker.open_until(streak, now)
+    if reopen:
+        # Le disjoncteur ne rapproche jamais l'essai prévu par le backoff d'erreur
+        due = max(due, reopen)
+        state, until = breaker.OPEN, due.isoformat(timespec="seconds")
+        log.warning(f"{name}: disjoncteur ouvert après {streak} échec(s), "
+                    f"prochain essai {due.strftime('%d/%m %H:%M')}")
+    elif schedule.get("circuit_state") not in (None, breaker.CLOSED):
+        log.info(f"{name}: source rétablie, disjoncteur refermé")
+    update_source_schedule(name, due.isoformat(timespec="seconds"), interval, streak, state, until)
+
+
+def _timed_scan(src: Source) -> tuple[list[JobOffer] | None, int]:
+    """Import and run a source's scraper, return (results, duration_ms)."""
     t0 = time.monotonic()
-    results = fn(*args)
+    try:
+        results = src.fn(*src.args)
+    except Exception as e:
+        log.error(f"{src.name}: exception non gérée dans le scraper: {e}")
+        results = None
     return results, int((time.monotonic() - t0) * 1000)
 
 
-def run_scan():
-    global _scan_running
+def _host_slot(host: str) -> threading.Semaphore:
     with _lock:
-        if _scan_running:
-            log.warning("Scan déjà en cours, skip.")
-            return
-        _scan_running = True
+        if host not in _host_slots:
+            _host_slots[host] = threading.Semaphore(SCAN_PER_HOST)
+        return _host_slots[host]
+
+
+def _scan_source(src: Source) -> tuple[list[JobOffer] | None, int, tuple[int, int]]:
+    import page_cache  # côté scan uniquement : tire requests, inutile au process API
+
+    with _host_slot(src.host):
+        events.publish("source_start", source=src.name)
+        page_cache.begin()
+        results, ms = _timed_scan(src)
+        return results, ms, page_cache.counters()
+
 
-    log.info(f"=== SCAN LANCÉ {datetime.now().strftime('%d/%m/%Y %H:%M')} ===")
+def _through_breaker(sources: list[Source], schedule: dict[str, dict],
+                     forced: bool = False) -> tuple[list[Source], list[Source]]:
+    """(allowed, blocked): drop sources whose breaker is open, flag half-open probes.
+    Forced sources (named explicitly) are never dropped: an open breaker is probed."""
+    now = datetime.now()
+    allowed, blocked = [], []
+    for src in sources:
+        state = breaker.state(schedule.get(src.name), now)
+        if state == breaker.OPEN and not forced:
+            log.info(f"{src.name}: disjoncteur ouvert, source sautée")
+            blocked.append(src)
+            continue
+        if state == breaker.OPEN:
+            log.info(f"{src.name}: disjoncteur ouvert, scan forcé d'essai")
+        elif state == breaker.HALF_OPEN:
+            log.info(f"{src.name}: disjoncteur semi-ouvert, scan d'essai")
+        if state != breaker.CLOSED:
+            set_circuit_state(src.name, breaker.HALF_OPEN)
+        allowed.append(src)
+    return allowed, blocked
+
+
+def _execute(sources: list[Source]) -> list[JobOffer]:
+    """Scrape sources in parallel; persistence stays on the calling thread."""
+    schedule = get_source_schedule()
     new_jobs: list[JobOffer] = []
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="scan") as pool:
+        futures = {pool.submit(_scan_source, src): src for src in sources}
+        for fut in as_completed(futures):
+            results, ms, cache = fut.result()
+            name = futures[fut].name
+            new_jobs += _run_source(name, results, ms, cache, schedule.get(name))
+    return new_jobs
+
+
+def _due_at(row: dict | None) -> datetime | None:
+    """When a source is next due; None if it was never scanned."""
+    row = row or {}
+    if row.get("next_due"):
+        return datetime.fromisoformat(row["next_due"])
+    if row.get("last_check"):
+        # Scanné avant la planification par source : intervalle par défaut
+        return datetime.fromisoformat(row["last_check"]) + timedelta(minutes=polling.DEFAULT_MINUTES)
+    return None
+
 
+def due_sources(now: datetime | None = None) -> list[Source]:
+    """Sources whose next_due has passed (or that were never scanned)."""
+    now = now or datetime.now()
+    schedule = get_source_schedule()
+    due = []
+    for src in all_sources():
+        due_at = _due_at(schedule.get(src.name))
+        if due_at is None or due_at <= now:
+            due.append(src)
+    return due
+
+
+def start_scan(sources: list[Source], scan_id: str | None = None,
+               forced: bool = False) -> dict | None:
+    """Claim the sources that aren't already being scanned nor behind an open
+    breaker (unless `forced`), and record the scan (scan_id comes from the queue
+    for scans requested through the API).
+    Returns the scan record, or None when no requested source can run."""
+    with _lock:
+        claimed = [s for s in sources if s.name not in _active]
+        _active.update(s.name for s in claimed)
+    busy = [s.name for s in sources if s not in claimed]
     try:
-        for slug, name, default_loc in BAMBOOHR_COMPANIES:
-            results, ms = _timed_scan(name, bamboohr.scan, slug, name, default_loc)
-            new_jobs += _run_source(name, results, ms)
+        claimed, blocked = _through_breaker(claimed, get_source_schedule(), forced)
+        with _lock:
+            _active.difference_update(s.name for s in blocked)
+        scan = {
+            "id": scan_id or uuid.uuid4().hex[:12],
+            "sources": [s.name for s in claimed],
+            "skipped": busy + [s.name for s in blocked],
+        }
+        status = "running" if claimed else "skipped"
+        record_scan(scan["id"], status, [s.name for s in sources], scan["sources"], scan["skipped"],
+                    holder)
+    except Exception:
+        with _lock:
+            _active.difference_update(s.name for s in claimed)
+        raise
+    if not claimed:
+        return None
+    with _lock:
+        _claimed[scan["id"]] = claimed
+    events.publish("scan_start", scan_id=scan["id"], sources=scan["sources"])
+    return scan
 
-        for slug, name, default_loc in RECRUITEE_COMPANIES:
-            results, ms = _timed_scan(name, recruitee.scan, slug, name, default_loc)
-            new_jobs += _run_source(name, results, ms)
 
-        for name, fn in CUSTOM_SCRAPERS:
-            results, ms = _timed_scan(name, fn)
-            new_jobs += _run_source(name, results, ms)
+def execute_scan(scan_id: str):
+    """Run a scan registered by start_scan, then release its sources."""
+    with _lock:
+        sources = _claimed.pop(scan_id)
+    log.info(f"=== SCAN {scan_id} LANCÉ {datetime.now().strftime('%d/%m/%Y %H:%M')} — "
+             f"{len(sources)} source(s) ===")
+    t0 = time.monotonic()
+    http_before = _http_totals()
+    status, new_jobs = "error", []
+
+    try:
+        new_jobs = _execute(sources)
+        status = "done"
 
-        now = datetime.now()
-        set_meta("last_scan", now.isoformat())
-        set_meta("next_scan", (now + timedelta(hours=CHECK_INTERVAL_HOURS)).isoformat())
+        set_meta("last_scan", datetime.now().isoformat())
+        next_due = get_next_due()
+        if next_due:
+            set_meta("next_scan", next_due)
 
-        log.info(f"=== SCAN TERMINÉ — {len(new_jobs)} nouvelle(s) offre(s) ===")
+        log.info(f"=== SCAN {scan_id} TERMINÉ — {len(new_jobs)} nouvelle(s) offre(s) "
+                 f"en {time.monotonic() - t0:.1f}s ===")
+        reqs, nbytes = (a - b for a, b in zip(_http_totals(), http_before))
+        log.info(f"HTTP: {reqs} requête(s), {nbytes // 1024} Ko reçus")
 
     finally:
         with _lock:
-            _scan_running = False
+            _active.difference_update(s.name for s in sources)
+        geocoder.flush()
+        finish_scan(scan_id, status, len(new_jobs))
+        events.publish("scan_done", scan_id=scan_id, status=status, new_jobs=len(new_jobs),
+                       duration_s=round(time.monotonic() - t0, 1))
+
+
+def _http_totals() -> tuple[int, int]:
+    import http_client
+
+    http = http_client.stats().values()
+    return sum(h["requests"] for h in http), sum(h["bytes"] for h in http)
+
+
+def _run(sources: list[Source], scan_id: str | None = None, forced: bool = False):
+    scan = start_scan(sources, scan_id, forced)
+    if scan is None:
+        log.warning("Aucune source disponible (scan déjà en cours ou disjoncteur ouvert), skip.")
+        return
+    execute_scan(scan["id"])
+
+
+def run_scan():
+    _run(all_sources())
+
+
+def run_due():
+    """Scheduler tick: scan only the sources that are due."""
+    sources = due_sources()
+    if sources:
+        _run(sources)
+
+
+def warm_start():
+    """Boot / lease takeover: scan only the stale sources. The fresh ones are
+    left to the scheduler tick, which picks each up once its next_due passes."""
+    sources = due_sources()
+    fresh = len(all_sources()) - len(sources)
+    log.info(f"Démarrage — dernier scan : {get_meta('last_scan') or 'jamais'} ; "
+             f"{len(sources)} source(s) à rafraîchir, {fresh} à jour"
+             + (f" (prochaine échéance {get_next_due()})" if fresh else ""))
+    if sources:
+        _run(sources)
+
+
+if __name__ == "__main__":
+    import worker
+    worker.main(sys.argv[1:])
@@ -2,37 +2,28 @@
 Generic BambooHR scraper.
 Usage: scan(company_slug, company_name, default_location)
 """
-import re
 import logging
-import requests
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
-PILOT_RE = re.compile(
-    r'\b(pilot|captain|first officer|commandant|copilot|copilote|pnt|f/o)\b',
-    re.IGNORECASE,
-)
-EXCLUDE_RE = re.compile(
-    r'\b(ground|dispatch|sales|accountant|mechanic|technician|instructor)\b',
-    re.IGNORECASE,
-)
-
 
 def scan(company_slug: str, company_name: str, default_location: str) -> list[JobOffer] | None:
     url = f"https://{company_slug}.bamboohr.com/careers/list"
     found: list[JobOffer] = []
     try:
-        r = requests.get(url, timeout=10)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(url, timeout=10)
+        if cached is not None:
+            return cached
         jobs = r.json().get("result", [])
+        pilots = for_source(company_name)
         for j in jobs:
             title = j.get("jobOpeningName", "")
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not pilots.is_pilot(title):
                 continue
             raw_loc = j.get("location", {})
             if isinstance(raw_loc, dict):
@@ -50,6 +41,7 @@ def scan(company_slug: str, company_name: str, default_location: str) -> list[Jo
                 lat=lat,
                 lon=lon,
             ))
+        page_cache.store(url, r, found)
         log.info(f"BambooHR {company_name}: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur BambooHR {company_name}: {e}")
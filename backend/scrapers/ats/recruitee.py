@@ -3,31 +3,28 @@ Generic Recruitee scraper.
 Usage: scan(company_slug, company_name, default_location)
 API: https://{slug}.recruitee.com/api/offers/
 """
-import re
 import logging
-import requests
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
-PILOT_RE = re.compile(
-    r'\b(pilot|captain|first officer|commandant|copilot|copilote|pnt|f/o)\b',
-    re.IGNORECASE,
-)
-
 
 def scan(company_slug: str, company_name: str, default_location: str) -> list[JobOffer] | None:
     url = f"https://{company_slug}.recruitee.com/api/offers/"
     found: list[JobOffer] = []
     try:
-        r = requests.get(url, timeout=10)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(url, timeout=10)
+        if cached is not None:
+            return cached
         offers = r.json().get("offers", [])
+        pilots = for_source(company_name)
         for o in offers:
             title = o.get("title", "")
-            if not PILOT_RE.search(title):
+            if not pilots.is_pilot(title):
                 continue
             loc = o.get("city") or o.get("location") or default_location
             link = (
@@ -44,6 +41,7 @@ def scan(company_slug: str, company_name: str, default_location: str) -> list[Jo
                 lat=lat,
                 lon=lon,
             ))
+        page_cache.store(url, r, found)
         log.info(f"Recruitee {company_name}: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Recruitee {company_name}: {e}")
@@ -6,19 +6,19 @@ Recrute des pilotes "Ready Entry" sur PC-12, PC-24, Learjet 45.
 import logging
 import re
 import urllib.parse
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 BASE    = "https://career.air-alliance.de"
 URL     = f"{BASE}/en"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
-PILOT_RE   = re.compile(r'\b(pilot|captain|first officer|commander|copilot|f/o|flight crew|pnt|kapitän)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|maintenance|technician|mechanic|arzt|medizin|ärztin|elektroniker|mechaniker|compliance|initiativ)\b', re.I)
+PILOTS  = for_source("Air Alliance")
 ZIP_RE  = re.compile(r'^\d{4,6}\s+')
 
 
@@ -44,8 +44,9 @@ def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for a in soup.find_all("a", href=True):
@@ -57,9 +58,7 @@ def scan() -> list[JobOffer] | None:
                 continue
             seen.add(href)
 
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             # Look for Google Maps location link within the job's own card (portlet)
@@ -87,6 +86,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(URL, r, found)
         log.info(f"Air Alliance: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Air Alliance: {e}")
@@ -2,26 +2,28 @@
 Amelia — API custom : career.flyamelia.com/api/offers/
 """
 import logging
-import requests
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 API_URL = "https://career.flyamelia.com/api/offers/"
-PILOT_KEYWORDS = {"pilot", "captain", "officier", "pnt", "commandant", "first officer", "copilot"}
+PILOTS  = for_source("Amelia")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     try:
-        r = requests.get(API_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(API_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
+        if cached is not None:
+            return cached
         offers = r.json().get("offers", [])
         for o in offers:
             title = o.get("title", "")
-            if not any(k in title.lower() for k in PILOT_KEYWORDS):
+            if not PILOTS.is_pilot(title):
                 continue
             link = (
                 o.get("careers_url")
@@ -39,6 +41,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat,
                 lon=lon,
             ))
+        page_cache.store(API_URL, r, found)
         if not found:
             log.info("Amelia: aucune offre PNT active")
         else:
@@ -5,19 +5,19 @@ vers /en/open-position-{slug}. Le texte du lien est le titre du poste.
 """
 import logging
 import re
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 URL     = "https://arcus-air.com/en/careers-at-arcus-air"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
-PILOT_RE   = re.compile(r'\b(pilots?|captains?|first officers?|second officers?|commanders?|copilots?|f/o|flight crew|flight deck)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|maintenance|engineer|technician|manager|director|dispatcher|sales|operations manager)\b', re.I)
+PILOTS     = for_source("Arcus Air")
 JOB_RE     = re.compile(r'/en/open-position-', re.I)
 
 
@@ -25,8 +25,9 @@ def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for a in soup.find_all("a", href=JOB_RE):
@@ -34,9 +35,7 @@ def scan() -> list[JobOffer] | None:
             title = a.get_text(strip=True)
             if not title or href in seen:
                 continue
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             seen.add(href)
@@ -51,6 +50,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(URL, r, found)
         log.info(f"Arcus Air: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Arcus Air: {e}")
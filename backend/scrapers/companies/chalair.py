@@ -3,34 +3,34 @@ Chalair Aviation — WordPress HTML statique.
 Les offres PNT sont listées directement dans le DOM.
 """
 import logging
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 URL     = "https://www.chalair.fr/offres-emplois"
 BASE    = "https://www.chalair.fr"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
-PILOT_KW    = {"pnt", "pilote", "captain", "commandant"}
-EXCLUDE_KW  = {"candidature spontanée", "candidature-spontanée"}
+PILOTS  = for_source("Chalair")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
         for a in soup.find_all("a", href=True):
             text = a.get_text(strip=True)
             href = a["href"].lower()
-            if not any(k in text.lower() or k in href for k in PILOT_KW):
-                continue
-            if any(k in text.lower() or k in href for k in EXCLUDE_KW):
+            # Intitulé du lien ou slug de l'URL
+            if not PILOTS.is_pilot(f"{text} {href}"):
                 continue
             link = a["href"] if a["href"].startswith("http") else BASE + a["href"]
             if link in seen or len(text) < 5:
@@ -46,6 +46,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat,
                 lon=lon,
             ))
+        page_cache.store(URL, r, found)
         log.info(f"Chalair: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Chalair: {e}")
@@ -5,19 +5,19 @@ Ville extraite du container (code postal + nom).
 """
 import logging
 import re
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 URL     = "https://www.das-private-jets.com/career"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
-PILOT_RE   = re.compile(r'\b(pilots?|captains?|kapit[äa]ns?|first officers?|copilots?|kopilots?|f/o|flight crew|phenom|embraer|emb\d)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(sales|verkauf|studium|ausbildung|kaufmann|kauffrau|b[üu]ro|management|operations manager|dispatch)\b', re.I)
+PILOTS     = for_source("DAS Private Jets")
 PLZ_RE     = re.compile(r'\b(\d{5})\s+([A-Za-zÄÖÜäöüß\-]+)')
 
 
@@ -25,8 +25,9 @@ def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for a in soup.find_all("a", href=True):
@@ -39,9 +40,7 @@ def scan() -> list[JobOffer] | None:
             title = a.get_text(strip=True)
             if not title:
                 continue
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             seen.add(href)
@@ -66,6 +65,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(URL, r, found)
         log.info(f"DAS Private Jets: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur DAS Private Jets: {e}")
@@ -5,27 +5,28 @@ Titres extraits du h2/h3 dans le bloc de chaque offre.
 """
 import logging
 import re
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 CAREERS_URL = "https://dat.dk/en/corporate/careers/"
 HEADERS     = {"User-Agent": "Mozilla/5.0"}
 CAREER_RE   = re.compile(r'/en/corporate/careers/[^/]+/$')
-PILOT_RE    = re.compile(r'\b(pilots?|captains?|first officers?|commanders?|copilots?|f/o|flight crew|pnt|cps?|fos?)\b', re.I)
-EXCLUDE_RE  = re.compile(r'\b(cabin|attendant|steward|maintenance|engineer|technician|sales|mcc|manager|chief pilot)\b', re.I)
+PILOTS      = for_source("Danish Air Transport")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(CAREERS_URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(CAREERS_URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for a in soup.find_all("a", href=True):
@@ -53,9 +54,7 @@ def scan() -> list[JobOffer] | None:
 
             if not title:
                 continue
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             lat, lon = get_coords("Copenhagen")
@@ -68,6 +67,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(CAREERS_URL, r, found)
         log.info(f"Danish Air Transport: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Danish Air Transport: {e}")
@@ -5,24 +5,25 @@ page individuelle (h1 + première ligne de localisation).
 """
 import logging
 import re
-import requests
 from bs4 import BeautifulSoup
+import http_client
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 CAREERS_URL = "https://elitavia.com/careers/"
 HEADERS     = {"User-Agent": "Mozilla/5.0"}
-PILOT_RE    = re.compile(r'\b(pilot|captain|first officer|commander|copilot|f/o|flight crew|pnt)\b', re.I)
-EXCLUDE_RE  = re.compile(r'\b(cabin|attendant|steward|maintenance|head of|travel|operations officer|nominated person)\b', re.I)
+PILOTS      = for_source("Elit'Avia")
 
 
 def _fetch_job(url: str) -> tuple[str, str]:
     """Return (title, location) from individual job post page."""
     try:
-        r = requests.get(url, headers=HEADERS, timeout=10)
+        r = http_client.get(url, headers=HEADERS, timeout=10)
         soup = BeautifulSoup(r.text, "html.parser")
         title = ""
         location = "Europe"
@@ -53,8 +54,9 @@ def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(CAREERS_URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(CAREERS_URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for a in soup.find_all("a", href=True):
@@ -66,15 +68,13 @@ def scan() -> list[JobOffer] | None:
             # Filtre rapide sur le slug avant de fetcher la page
             slug = href.rstrip("/").split("/")[-1]
             slug_text = re.sub(r'^job-post-', '', slug).replace("-", " ")
-            if not PILOT_RE.search(slug_text):
-                continue
-            if EXCLUDE_RE.search(slug_text):
+            if not PILOTS.is_pilot(slug_text):
                 continue
 
             title, location = _fetch_job(href)
             if not title:
                 title = slug_text.title()
-            if not PILOT_RE.search(title) or EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             lat, lon = get_coords(location)
@@ -87,6 +87,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(CAREERS_URL, r, found)
         log.info(f"Elit'Avia: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Elit'Avia: {e}")
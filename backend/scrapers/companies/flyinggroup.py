@@ -4,26 +4,26 @@ WordPress REST API : catégorie 7 = "Job".
 Pas de postes pilote actuellement, mais le scraper se déclenche dès ouverture.
 """
 import logging
-import re
-import requests
 from html import unescape
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 API_URL   = "https://www.flyinggroup.aero/wp-json/wp/v2/posts?categories=7&per_page=50&status=publish"
 HEADERS   = {"User-Agent": "Mozilla/5.0"}
-PILOT_RE  = re.compile(r'\b(pilot|captain|first officer|commander|copilot|f/o|flight crew|pnt)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|maintenance|technician|fueler|desk|driver|chauffeur|occ|airworthiness|finance|sales|marketing|hr|accounting)\b', re.I)
+PILOTS    = for_source("Flying Group")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     try:
-        r = requests.get(API_URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(API_URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         posts = r.json()
 
         for post in posts:
@@ -31,9 +31,7 @@ def scan() -> list[JobOffer] | None:
             link  = post.get("link", "")
             if not title or not link:
                 continue
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             lat, lon = get_coords("Antwerp")
@@ -46,6 +44,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(API_URL, r, found)
         log.info(f"Flying Group: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Flying Group: {e}")
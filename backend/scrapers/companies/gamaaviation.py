@@ -4,11 +4,12 @@ Salesforce Recruit : même portail que Loganair, colonnes différentes.
 """
 import logging
 import re
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
@@ -16,16 +17,16 @@ BASE = "https://gama-aviation.my.salesforce-sites.com"
 URL  = f"{BASE}/Recruit/fRecruit__ApplyJobList?portal=Myairops+Portal"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
-PILOT_RE   = re.compile(r'\b(pilots?|captains?|first officers?|second officers?|commanders?|copilots?|co-pilots?|f/o|flight crew|flight deck)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|maintenance|engineer|technician|mechanic|manager|director|recruiter|trainer|instructor)\b', re.I)
+PILOTS = for_source("Gama Aviation")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for tr in soup.find_all("tr"):
@@ -44,9 +45,7 @@ def scan() -> list[JobOffer] | None:
 
             if not title or href in seen:
                 continue
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             seen.add(href)
@@ -61,6 +60,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(URL, r, found)
         log.info(f"Gama Aviation: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Gama Aviation: {e}")
@@ -4,19 +4,19 @@ Portail custom globeair.com/career, liens vers /j/{id}.
 """
 import logging
 import re
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 URL     = "https://www.globeair.com/career"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
-PILOT_RE   = re.compile(r'\b(pilots?|captains?|first officers?|second officers?|commanders?|copilots?|f/o|flight crew|flight deck)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|maintenance|engineer|technician|manager|director|logistics|procurement|marketing|sales|accountant|buchhalter)\b', re.I)
+PILOTS     = for_source("GlobeAir")
 JOB_RE     = re.compile(r'/j/\d+')
 
 
@@ -24,8 +24,9 @@ def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for col in soup.find_all("div", class_="column"):
@@ -43,9 +44,7 @@ def scan() -> list[JobOffer] | None:
             title = re.sub(r"View opportunity.*$", "", full_text, flags=re.I).strip()
             if not title:
                 continue
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             seen.add(href)
@@ -60,6 +59,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(URL, r, found)
         log.info(f"GlobeAir: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur GlobeAir: {e}")
@@ -4,32 +4,34 @@ Surveille la page /flightcrew : les postes ouverts apparaissent comme
 liens de navigation avec ancres (#id) pointant vers des sections de détail.
 """
 import logging
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 URL     = "https://career.helvetic.com/flightcrew"
 BASE    = "https://career.helvetic.com"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
-PILOT_RE_WORDS = {"pilot", "captain", "first officer", "commander", "copilot", "f/o", "pnt", "crew"}
-EXCLUDE_WORDS  = {"cabin", "attendant", "steward", "maintenance", "backoffice", "cadet"}
+PILOTS  = for_source("Helvetic Airways")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         # Pas d'offres en ce moment — signal explicite
         if "keine offenen stellen" in soup.get_text().lower():
             log.info("Helvetic: aucun poste flight crew en ce moment")
-            return []
+            page_cache.store(URL, r, found)
+            return found
 
         # Parser les liens de navigation vers les sections de postes
         seen = set()
@@ -41,13 +43,13 @@ def scan() -> list[JobOffer] | None:
             if not title or len(title) < 4:
                 continue
 
-            title_low = title.lower()
-            if any(w in title_low for w in EXCLUDE_WORDS):
+            included, excluded = PILOTS.scan(title)
+            if excluded:
                 continue
-            if not any(w in title_low for w in PILOT_RE_WORDS):
+            if not included:
                 # accepter si la section contient des mots pilote
                 section = soup.find(id=href.lstrip("#"))
-                if not section or not any(w in section.get_text().lower() for w in PILOT_RE_WORDS):
+                if not section or not PILOTS.scan(section.get_text())[0]:
                     continue
 
             if title in seen:
@@ -66,6 +68,7 @@ def scan() -> list[JobOffer] | None:
                 lon=lon,
             ))
 
+        page_cache.store(URL, r, found)
         log.info(f"Helvetic: {len(found)} offre(s) flight crew")
     except Exception as e:
         log.error(f"Erreur Helvetic: {e}")
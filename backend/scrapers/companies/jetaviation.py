@@ -4,19 +4,19 @@ Page Europe statique sur jobs.jetaviation.com/go/Europe/8766702/.
 """
 import logging
 import re
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 URL     = "https://jobs.jetaviation.com/go/Europe/8766702/"
 BASE    = "https://jobs.jetaviation.com"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
-PILOT_RE   = re.compile(r'\b(pilots?|captains?|first officers?|second officers?|commanders?|copilots?|f/o|flight crew|flight deck|pnt)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|maintenance|engineer|technician|intern|manager|director|recruiter)\b', re.I)
+PILOTS  = for_source("Jet Aviation")
 CITY_RE    = re.compile(r'^([^,]+)')
 
 
@@ -24,8 +24,9 @@ def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for tr in soup.find_all("tr"):
@@ -37,9 +38,7 @@ def scan() -> list[JobOffer] | None:
             if not title or not href or href in seen:
                 continue
 
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             seen.add(href)
@@ -64,6 +63,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(URL, r, found)
         log.info(f"Jet Aviation: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Jet Aviation: {e}")
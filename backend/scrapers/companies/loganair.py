@@ -3,28 +3,28 @@ Loganair — Compagnie régionale écossaise (ATR-72, Twin Otter, Saab 340...).
 Portail Salesforce Recruit : HTML statique, tous les jobs visibles en page 1.
 """
 import logging
-import re
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 BASE    = "https://loganair.my.salesforce-sites.com"
 URL     = f"{BASE}/recruit/fRecruit__ApplyJobList"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
-PILOT_RE   = re.compile(r'\b(pilots?|captains?|first officers?|commanders?|copilots?|f/o|flight crew|flight deck|cps?|fos?)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|maintenance|engineer|technician|finance|sales|account|manager|head of)\b', re.I)
+PILOTS  = for_source("Loganair")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for a in soup.find_all("a", href=True):
@@ -40,9 +40,7 @@ def scan() -> list[JobOffer] | None:
                 continue
             seen.add(link)
 
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             # Location from the table row (3rd td after the job title link)
@@ -65,6 +63,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(URL, r, found)
         log.info(f"Loganair: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Loganair: {e}")
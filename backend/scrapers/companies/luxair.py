@@ -5,10 +5,11 @@ puis on appelle l'API rec-job-search/external/jobs sur uk.api.csod.com.
 """
 import logging
 import re
-import requests
+import http_client
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
@@ -17,15 +18,14 @@ API_URL    = "https://uk.api.csod.com/rec-job-search/external/jobs"
 JOB_URL    = "https://luxair.csod.com/ux/ats/careersite/27/home?c=luxair&requisitionId={req_id}"
 HEADERS    = {"User-Agent": "Mozilla/5.0"}
 
-PILOT_RE   = re.compile(r'\b(pilots?|captains?|first officers?|second officers?|commanders?|copilots?|f/o|flight crew|flight deck)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|technician|mechanic|intern|stage|summer|apprenti)\b', re.I)
+PILOTS = for_source("Luxair")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     try:
         # Session obligatoire : CSOD valide le token via le cookie BrowserId
-        session = requests.Session()
+        session = http_client.new_session()
         session.headers.update(HEADERS)
 
         r = session.get(CAREER_URL, timeout=15)
@@ -68,9 +68,7 @@ def scan() -> list[JobOffer] | None:
             title = req.get("displayJobTitle", "").strip()
             if not title:
                 continue
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             req_id = req["requisitionId"]
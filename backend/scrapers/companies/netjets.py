@@ -3,32 +3,34 @@ NetJets Europe — SAP SuccessFactors (HTML scraping).
 Search endpoint: netjets.jobs.hr.cloud.sap
 """
 import logging
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 SEARCH_URL = "https://netjets-proxy.dumassimon22.workers.dev/"
 BASE_URL   = "https://netjets.jobs.hr.cloud.sap"
 HEADERS    = {"User-Agent": "Mozilla/5.0"}
-PILOT_KW   = {"pilot", "captain", "first officer", "second in command", "f/o", "pic", "sic"}
+PILOTS     = for_source("NetJets Europe")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     try:
-        r = requests.get(SEARCH_URL, headers=HEADERS, timeout=30)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(SEARCH_URL, headers=HEADERS, timeout=30)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
         for row in soup.find_all("tr"):
             link_tag = row.find("a", href=True)
             if not link_tag:
                 continue
             title = link_tag.get_text(strip=True)
-            if not any(k in title.lower() for k in PILOT_KW):
+            if not PILOTS.is_pilot(title):
                 continue
             href = link_tag["href"]
             if not href.startswith("http"):
@@ -45,6 +47,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat,
                 lon=lon,
             ))
+        page_cache.store(SEARCH_URL, r, found)
         log.info(f"NetJets: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur NetJets: {e}")
@@ -3,32 +3,33 @@ Oyonnair — WordPress HTML statique.
 Pas d'ATS. Surveille la page texte pour détecter une ouverture de recrutement.
 """
 import logging
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 URL     = "https://www.oyonnair.com/compagnie-aerienne/recrutement/"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
-PILOT_KW  = {"pilote", "pnt", "commandant", "capitaine", "captain"}
+PILOTS    = for_source("Oyonnair")
 FULL_KW   = {"effectifs sont complets", "effectifs complets", "pas de recrutement"}
-EXCL_KW   = {"régulièrement", "rejoignez-nous", "recrutement", "domaines", "tels que"}
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
         page_text = soup.get_text().lower()
 
         if any(k in page_text for k in FULL_KW):
             lat, lon = get_coords("Lyon")
-            return [JobOffer(
+            found = [JobOffer(
                 id=job_hash("Effectifs complets", URL),
                 title="Effectifs complets",
                 link=URL,
@@ -37,12 +38,12 @@ def scan() -> list[JobOffer] | None:
                 status="full",
                 lat=lat, lon=lon,
             )]
+            page_cache.store(URL, r, found)
+            return found
 
         for elem in soup.find_all(["h2", "h3", "a"]):
             text = elem.get_text(strip=True)
-            if not any(k in text.lower() for k in PILOT_KW):
-                continue
-            if any(ex in text.lower() for ex in EXCL_KW) or len(text) > 100:
+            if not PILOTS.is_pilot(text) or len(text) > 100:
                 continue
             link = URL
             if elem.name == "a" and elem.has_attr("href") and "recrutement" not in elem["href"]:
@@ -59,6 +60,7 @@ def scan() -> list[JobOffer] | None:
 
         seen = set()
         found = [j for j in found if j.title not in seen and not seen.add(j.title)]
+        page_cache.store(URL, r, found)
         log.info(f"Oyonnair: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Oyonnair: {e}")
@@ -4,31 +4,33 @@ Surveille la page pour détecter l'ouverture d'un recrutement pilote.
 Email de contact : peas.jobs@gmail.com
 """
 import logging
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 URL     = "https://www.paneuropeenne.com/en/"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
-PILOT_KW = {"pilot", "captain", "first officer", "f/o", "pnt"}
+PILOTS   = for_source("Pan Européenne")
 FULL_KW  = {"no employment at the moment", "no employment", "no vacancy"}
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
         page_text = soup.get_text().lower()
         lat, lon = get_coords("Chambéry")
 
         if any(k in page_text for k in FULL_KW):
-            return [JobOffer(
+            found = [JobOffer(
                 id=job_hash("Effectifs complets", URL),
                 title="Effectifs complets",
                 link=URL,
@@ -37,10 +39,12 @@ def scan() -> list[JobOffer] | None:
                 status="full",
                 lat=lat, lon=lon,
             )]
+            page_cache.store(URL, r, found)
+            return found
 
         for elem in soup.find_all(["h2", "h3", "h4", "p", "li", "a"]):
             text = elem.get_text(strip=True)
-            if not any(k in text.lower() for k in PILOT_KW):
+            if not PILOTS.is_pilot(text):
                 continue
             if len(text) < 10 or len(text) > 200:
                 continue
@@ -58,6 +62,7 @@ def scan() -> list[JobOffer] | None:
 
         seen = set()
         found = [j for j in found if j.title not in seen and not seen.add(j.title)]
+        page_cache.store(URL, r, found)
         log.info(f"Pan Européenne: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Pan Européenne: {e}")
@@ -3,12 +3,12 @@ Platoon Aviation — Opérateur bizjet PC-24 basé à Hamburg.
 Personio ATS : feed XML public à /xml, pas d'auth requise.
 """
 import logging
-import re
-import requests
 from xml.etree import ElementTree as ET
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
@@ -16,15 +16,15 @@ XML_URL  = "https://platoon-aviation.jobs.personio.de/xml"
 BASE_URL = "https://platoon-aviation.jobs.personio.de/job/{job_id}"
 HEADERS  = {"User-Agent": "Mozilla/5.0"}
 
-PILOT_RE   = re.compile(r'\b(pilots?|captains?|first officers?|second officers?|commanders?|copilots?|f/o|flight crew|flight deck|ab.initio)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|maintenance|engineer|dispatcher|recruiter|sales|manager|controller|head of|CAMO)\b', re.I)
+PILOTS = for_source("Platoon Aviation")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     try:
-        r = requests.get(XML_URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(XML_URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         root = ET.fromstring(r.content)
 
         for pos in root.findall("position"):
@@ -34,9 +34,7 @@ def scan() -> list[JobOffer] | None:
 
             if not title or not job_id:
                 continue
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             link = BASE_URL.format(job_id=job_id)
@@ -50,6 +48,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(XML_URL, r, found)
         log.info(f"Platoon Aviation: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Platoon Aviation: {e}")
@@ -4,36 +4,34 @@ WordPress SiteOrigin accordion : titres dans class sow-accordion-title.
 Pas de liens individuels, lien fixe vers la page carrières.
 """
 import logging
-import re
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
 URL     = "https://www.spreeflug.de/en/career-jobs/"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
-PILOT_RE   = re.compile(r'\b(pilots?|captains?|first officers?|commanders?|copilots?|f/o|flight crew|flight deck)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|maintenance|engineer|technician|manager|director|dispatch|sales|administrative|commercial)\b', re.I)
+PILOTS = for_source("Spreeflug")
 
 
 def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for el in soup.find_all(class_="sow-accordion-title"):
             title = el.get_text(strip=True)
             if not title:
                 continue
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             lat, lon = get_coords("Berlin")
@@ -46,6 +44,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(URL, r, found)
         log.info(f"Spreeflug: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur Spreeflug: {e}")
@@ -5,11 +5,12 @@ Filtre sur Company != Vista America pour garder uniquement les postes EU/global.
 """
 import logging
 import re
-import requests
 from bs4 import BeautifulSoup
+import page_cache
 from models import JobOffer
 from storage import job_hash
 from geocoder import get_coords
+from classifier import for_source
 
 log = logging.getLogger(__name__)
 
@@ -22,8 +23,7 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0",
     "Referer": "https://hub-vistaglobal.icims.com/",
 }
-PILOT_RE   = re.compile(r'\b(pilots?|captains?|first officers?|second officers?|commanders?|copilots?|f/o|flight crew|flight deck|tri|tre|type rating)\b', re.I)
-EXCLUDE_RE = re.compile(r'\b(cabin|attendant|steward|maintenance|engineer|technician|manager|director|recruiter|host)\b', re.I)
+PILOTS = for_source("VistaJet")
 US_COMPANIES = {"vista america", "xo", "xojet"}
 US_LOCATIONS = {"united states", "columbus", "teterboro", "bay city", "bridgeport", "van nuys"}
 
@@ -42,8 +42,9 @@ def scan() -> list[JobOffer] | None:
     found: list[JobOffer] = []
     seen: set[str] = set()
     try:
-        r = requests.get(URL, headers=HEADERS, timeout=15)
-        r.raise_for_status()
+        r, cached = page_cache.fetch(URL, headers=HEADERS, timeout=15)
+        if cached is not None:
+            return cached
         soup = BeautifulSoup(r.text, "html.parser")
 
         for card in soup.find_all(class_="iCIMS_JobCardItem"):
@@ -56,9 +57,7 @@ def scan() -> list[JobOffer] | None:
             if not title or href in seen:
                 continue
 
-            if not PILOT_RE.search(title):
-                continue
-            if EXCLUDE_RE.search(title):
+            if not PILOTS.is_pilot(title):
                 continue
 
             group = card.find(class_="iCIMS_JobHeaderGroup")
@@ -89,6 +88,7 @@ def scan() -> list[JobOffer] | None:
                 lat=lat, lon=lon,
             ))
 
+        page_cache.store(URL, r, found)
         log.info(f"VistaJet: {len(found)} offre(s) PNT")
     except Exception as e:
         log.error(f"Erreur VistaJet: {e}")
@@ -0,0 +1,95 @@
+"""
+Catalogue déclaratif des sources scannées.
+Chaque source référence son module scraper par nom : le module (et donc bs4,
+playwright, geopy via geocoder…) n'est importé qu'au premier scan qui l'exécute.
+Le process API n'importe que ce catalogue (validation de POST /api/scan) :
+aucun scraper n'y est chargé, les scans tournent dans le worker (python -m scanner worker).
+"""
+from importlib import import_module
+from typing import Callable, NamedTuple
+
+from models import JobOffer
+
+FAMILIES = ("bamboohr", "recruitee", "custom")
+
+BAMBOOHR_COMPANIES = [
+    ("jetfly",      "Jetfly",       "Luxembourg"),
+    ("comlux",      "Comlux",       "Luxembourg"),
+    ("luxaviation", "Luxaviation",  "Luxembourg"),
+]
+
+RECRUITEE_COMPANIES = [
+    ("dcaviationgmbh", "DC Aviation",  "Stuttgart"),
+    ("tagaviation3",   "TAG Aviation", "Geneva"),
+    ("astonjet",       "AstonJet",     "Paris Le Bourget"),
+]
+
+# (nom, module dans scrapers.companies, host) — le host sert au plafond de requêtes par serveur
+CUSTOM_SCRAPERS = [
+    ("Amelia",                "amelia",          "career.flyamelia.com"),
+    ("NetJets Europe",        "netjets",         "netjets-proxy.dumassimon22.workers.dev"),  # via Cloudflare Worker
+    ("La Compagnie",          "la_compagnie",    "careers.werecruit.io"),
+    ("Chalair",               "chalair",         "www.chalair.fr"),
+    ("Pan Européenne",        "pan_europeenne",  "www.paneuropeenne.com"),
+    ("Helvetic Airways",      "helvetic",        "career.helvetic.com"),
+    ("Elit'Avia",             "elitavia",        "elitavia.com"),
+    ("Avcon Jet",             "avconjet",        "www.avconjet.at"),
+    ("Flying Group",          "flyinggroup",     "www.flyinggroup.aero"),
+    ("Air Alliance",          "air_alliance",    "career.air-alliance.de"),
+    ("Danish Air Transport",  "dat",             "dat.dk"),
+    ("Loganair",              "loganair",        "loganair.my.salesforce-sites.com"),
+    ("Jet Aviation",          "jetaviation",     "jobs.jetaviation.com"),
+    ("VistaJet",              "vistajet",        "hub-vistaglobal.icims.com"),
+    ("Luxair",                "luxair",          "luxair.csod.com"),
+    ("Platoon Aviation",      "platoon",         "platoon-aviation.jobs.personio.de"),
+    ("Gama Aviation",         "gamaaviation",    "gama-aviation.my.salesforce-sites.com"),
+    ("Widerøe",               "wideroe",         "jobbiwideroe.no"),
+    ("Spreeflug",             "spreeflug",       "www.spreeflug.de"),
+    ("GlobeAir",              "globeair",        "www.globeair.com"),
+    ("Arcus Air",             "arcusair",        "arcus-air.com"),
+    ("DAS Private Jets",      "dasprivatejets",  "www.das-private-jets.com"),
+    ("GlobalJet",             "globaljet",       "globaljet.aero"),
+    ("Air Corsica",           "aircorsica",      "aircorsica-rh.my.salesforce-sites.com"),
+]
+
+
+class Source(NamedTuple):
+    name: str
+    host: str
+    module: str          # chemin importable, ex. "scrapers.companies.chalair"
+    args: tuple = ()
+    family: str = "custom"
+
+    @property
+    def fn(self) -> Callable[..., list[JobOffer] | None]:
+        return import_module(self.module).scan
+
+
+def all_sources() -> list[Source]:
+    # Les comptes BambooHR / Recruitee partagent la même infra : un seul host par ATS
+    sources = [Source(name, "bamboohr.com", "scrapers.ats.bamboohr", (slug, name, loc), "bamboohr")
+               for slug, name, loc in BAMBOOHR_COMPANIES]
+    sources += [Source(name, "recruitee.com", "scrapers.ats.recruitee", (slug, name, loc), "recruitee")
+                for slug, name, loc in RECRUITEE_COMPANIES]
+    sources += [Source(name, host, f"scrapers.companies.{module}")
+                for name, module, host in CUSTOM_SCRAPERS]
+    return sources
+
+
+def select_sources(names: list[str] | None = None, family: str | None = None) -> list[Source]:
+    """Filter the catalogue by source name (case-insensitive) and/or ATS family.
+    Raises ValueError on an unknown name or family, or an empty name list."""
+    if names is not None and not names:
+        raise ValueError("Liste de sources vide")
+    sources = all_sources()
+    if family:
+        if family.lower() not in FAMILIES:
+            raise ValueError(f"Famille inconnue : {family}")
+        sources = [s for s in sources if s.family == family.lower()]
+    if names:
+        by_name = {s.name.lower(): s for s in sources}
+        unknown = [n for n in names if n.lower() not in by_name]
+        if unknown:
+            raise ValueError(f"Source(s) inconnue(s) : {', '.join(unknown)}")
+        sources = [by_name[n.lower()] for n in dict.fromkeys(names)]
+    return sources
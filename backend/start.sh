@@ -0,0 +1,5 @@
+#!/bin/sh
+# Conteneur seul (docker run) : worker scanner en arrière-plan, API au premier plan.
+# docker compose lance les deux dans des services séparés (command: de chaque service).
+python -m scanner worker &
+exec uvicorn main:app --host 0.0.0.0 --port 8000
@@ -1,16 +1,50 @@
 import os
 import sqlite3
+import base64
 import hashlib
+import json
+import re
+import threading
+import time
 from datetime import datetime
 from typing import Optional
 from models import JobOffer
 
 DB_FILE = os.getenv("DB_FILE", "wingjobs.db")
+JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+
+# WAL : les lecteurs (API) ne sont jamais bloqués par l'écrivain (scan).
+# synchronous=NORMAL est sûr en WAL : au pire on perd la dernière transaction sur coupure.
+PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-16000",      # 16 Mo
+    "PRAGMA mmap_size=268435456",    # 256 Mo
+    "PRAGMA temp_store=MEMORY",
+)
+
+_local = threading.local()
+
+
+def connect() -> sqlite3.Connection:
+    """Thread-local connection to DB_FILE, opened once per thread with the pragmas above.
+    Use as `with connect() as conn:` — the block commits, it doesn't close."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != DB_FILE:
+        conn = sqlite3.connect(DB_FILE, timeout=5)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA journal_mode={JOURNAL_MODE}")
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        _local.conn, _local.path = conn, DB_FILE
+    return conn
 
 
 def init_db():
-    with sqlite3.connect(DB_FILE) as conn:
-        conn.executescript("""
+    # L'API et le worker migrent au même démarrage : tout se fait sous le verrou d'écriture
+    with connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        _script(conn, """
             CREATE TABLE IF NOT EXISTS jobs (
                 id          TEXT PRIMARY KEY,
                 title       TEXT NOT NULL,
@@ -22,13 +56,20 @@ def init_db():
                 lon         REAL DEFAULT 10.0,
                 first_seen  TEXT NOT NULL,
                 last_seen   TEXT NOT NULL,
-                notified    INTEGER DEFAULT 0
+                notified    INTEGER DEFAULT 0,
+                source_key  TEXT,            -- source normalisée (casefold), filtre indexé
+                change_seq  INTEGER DEFAULT 0,  -- transaction qui l'a créée / fait changer de statut
+                geo_pending INTEGER DEFAULT 0   -- lieu à géocoder par le worker (lat/lon provisoires)
             );
             CREATE TABLE IF NOT EXISTS geocache (
                 location    TEXT PRIMARY KEY,
                 lat         REAL NOT NULL,
                 lon         REAL NOT NULL
             );
+            CREATE TABLE IF NOT EXISTS geocache_miss (
+                location    TEXT PRIMARY KEY,   -- introuvable ou erreur Nominatim
+                expires_at  REAL NOT NULL       -- epoch : nouvel essai après cette date
+            );
             CREATE TABLE IF NOT EXISTS meta (
                 key         TEXT PRIMARY KEY,
                 value       TEXT
@@ -39,126 +80,740 @@ def init_db():
                 status      TEXT NOT NULL,   -- ok | error
                 jobs_found  INTEGER DEFAULT 0,
                 error_msg   TEXT,
-                duration_ms INTEGER
+                duration_ms INTEGER,
+                cache_hits  INTEGER DEFAULT 0,
+                cache_checks INTEGER DEFAULT 0,
+                next_due    TEXT,
+                poll_interval_min INTEGER,
+                fail_streak INTEGER DEFAULT 0,
+                circuit_state TEXT DEFAULT 'closed',   -- closed | open | half_open
+                open_until  TEXT
+            );
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url           TEXT PRIMARY KEY,
+                etag          TEXT,
+                last_modified TEXT,
+                body_hash     TEXT NOT NULL,
+                results       TEXT NOT NULL,   -- JSON des JobOffer extraits
+                parsed_at     TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS scans (
+                id           TEXT PRIMARY KEY,
+                status       TEXT NOT NULL,   -- queued | running | done | error | skipped
+                requested    TEXT NOT NULL,   -- JSON : sources demandées
+                sources      TEXT,            -- JSON : sources effectivement scannées
+                skipped      TEXT,            -- JSON : déjà en cours ailleurs ou disjoncteur ouvert
+                forced       INTEGER DEFAULT 0, -- sources nommées explicitement (POST /api/scan)
+                holder       TEXT,            -- bail du worker qui l'exécute (leases.holder)
+                requested_at TEXT NOT NULL,
+                started_at   TEXT,
+                finished_at  TEXT,
+                new_jobs     INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_scans_status ON scans(status, requested_at);
+            CREATE TABLE IF NOT EXISTS events (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                type        TEXT NOT NULL,
+                data        TEXT NOT NULL,   -- JSON
+                created_at  REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_events_created ON events(created_at);
+            CREATE TABLE IF NOT EXISTS leases (
+                name        TEXT PRIMARY KEY,
+                holder      TEXT NOT NULL,   -- host:pid:nonce du process détenteur
+                expires_at  REAL NOT NULL    -- epoch (s), renouvelé par heartbeat
             );
         """)
+        _add_columns(conn, "source_status", {
+            "cache_hits":   "INTEGER DEFAULT 0",
+            "cache_checks": "INTEGER DEFAULT 0",
+            "next_due":     "TEXT",
+            "poll_interval_min": "INTEGER",
+            "fail_streak":  "INTEGER DEFAULT 0",
+            "circuit_state": "TEXT DEFAULT 'closed'",
+            "open_until":   "TEXT",
+        })
+        _add_columns(conn, "scans", {"forced": "INTEGER DEFAULT 0", "holder": "TEXT"})
+        if "source_key" not in _columns(conn, "jobs"):
+            _add_columns(conn, "jobs", {"source_key": "TEXT"})
+            for (source,) in conn.execute("SELECT DISTINCT source FROM jobs").fetchall():
+                conn.execute("UPDATE jobs SET source_key = ? WHERE source = ?",
+                             (source_key(source), source))
+        if "change_seq" not in _columns(conn, "jobs"):
+            _add_columns(conn, "jobs", {"change_seq": "INTEGER DEFAULT 0"})
+            conn.execute("UPDATE jobs SET change_seq = 1")   # l'existant : un premier lot
+        _add_columns(conn, "jobs", {"geo_pending": "INTEGER DEFAULT 0"})
+        _script(conn, """
+            -- (first_seen, id) : ordre de pagination (un scan insère des lots au même first_seen)
+            DROP INDEX IF EXISTS idx_jobs_first_seen;
+            DROP INDEX IF EXISTS idx_jobs_status_seen;
+            DROP INDEX IF EXISTS idx_jobs_source_key;
+            CREATE INDEX IF NOT EXISTS idx_jobs_recent        ON jobs(first_seen, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_recent ON jobs(status, first_seen, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_source_recent ON jobs(source_key, first_seen, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_source_status ON jobs(source, status);
+            CREATE INDEX IF NOT EXISTS idx_jobs_changes       ON jobs(change_seq, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_geo_pending   ON jobs(location) WHERE geo_pending = 1;
+        """)
+        _init_search(conn)
+
+
+def _script(conn: sqlite3.Connection, sql: str):
+    """executescript() inside the current transaction (executescript commits first)."""
+    statement = ""
+    for line in sql.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+
+
+def _add_columns(conn: sqlite3.Connection, table: str, columns: dict[str, str]):
+    """Add columns missing from an existing table (CREATE IF NOT EXISTS won't)."""
+    existing = _columns(conn, table)
+    for name, decl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+
+# Le trigger de mise à jour ne porte que sur title, location, source : le
+# last_seen/status réécrit à chaque scan ne touche pas l'index.
+# Un VACUUM peut renuméroter les rowid de jobs : reconstruire l'index ensuite
+# (INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild')).
+SEARCH_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, location, source,
+        content='jobs', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, location, source)
+        VALUES (new.rowid, new.title, new.location, new.source);
+    END;
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, location, source)
+        VALUES ('delete', old.rowid, old.title, old.location, old.source);
+    END;
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, location, source ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, location, source)
+        VALUES ('delete', old.rowid, old.title, old.location, old.source);
+        INSERT INTO jobs_fts(rowid, title, location, source)
+        VALUES (new.rowid, new.title, new.location, new.source);
+    END;
+"""
+SEARCH_WEIGHTS = (10.0, 4.0, 1.0)   # bm25 : un mot du titre compte plus qu'un mot du lieu
+
+_search: dict[str, bool] = {}
+
+
+def _init_search(conn: sqlite3.Connection):
+    """Create and fill jobs_fts on first run; without FTS5, search falls back to LIKE."""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts'").fetchone() is None:
+        try:
+            _script(conn, SEARCH_SCHEMA)
+            conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            if "fts5" not in str(e):
+                raise
+            _search[DB_FILE] = False   # SQLite compilé sans FTS5
+            return
+    _search[DB_FILE] = True
+
+
+def search_enabled() -> bool:
+    if DB_FILE not in _search:
+        with connect() as conn:
+            _search[DB_FILE] = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts'").fetchone() is not None
+    return _search[DB_FILE]
+
+
+def match_expression(q: str) -> Optional[str]:
+    """User text → FTS5 query: every word must match, as a prefix ("cop gen" → Copilote, Genève).
+    Words are quoted, so FTS5 operators and punctuation in q are taken literally."""
+    words = re.findall(r"\w+", q)
+    return " ".join(f'"{w}"*' for w in words) or None
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def source_key(source: str) -> str:
+    """Normalized source name stored in jobs.source_key ("Widerøe" and "WIDERØE" match)."""
+    return source.strip().casefold()
 
 
 def job_hash(title: str, link: str) -> str:
     return hashlib.sha256(f"{title}||{link}".encode()).hexdigest()[:20]
 
 
+def _begin_change(conn: sqlite3.Connection) -> int:
+    """Take the write lock and return this transaction's change sequence number.
+    Every job inserted, or whose status or coordinates change, in the transaction gets it, so
+    /api/jobs/changes can hand out everything written after a given point."""
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    return conn.execute("SELECT COALESCE(MAX(change_seq), 0) + 1 FROM jobs").fetchone()[0]
+
+
 def upsert_job(job: JobOffer) -> bool:
     """Insert or update a job. Returns True if the job is brand new."""
     now = datetime.now().isoformat()
-    with sqlite3.connect(DB_FILE) as conn:
+    with connect() as conn:
+        seq = _begin_change(conn)
         existing = conn.execute(
             "SELECT id FROM jobs WHERE id = ?", (job.id,)
         ).fetchone()
         if existing:
             conn.execute(
-                "UPDATE jobs SET last_seen = ?, status = ? WHERE id = ?",
-                (now, job.status, job.id),
+                """UPDATE jobs SET last_seen = ?, status = ?,
+                     change_seq = CASE WHEN status != ? THEN ? ELSE change_seq END
+                   WHERE id = ?""",
+                (now, job.status, job.status, seq, job.id),
             )
             return False
         conn.execute(
             """INSERT INTO jobs
-               (id, title, link, location, source, status, lat, lon, first_seen, last_seen, notified)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)""",
-            (job.id, job.title, job.link, job.location, job.source,
-             job.status, job.lat, job.lon, now, now),
+               (id, title, link, location, source, source_key, status, lat, lon,
+                first_seen, last_seen, notified, change_seq, geo_pending)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?)""",
+            (job.id, job.title, job.link, job.location, job.source, source_key(job.source),
+             job.status, job.lat, job.lon, now, now, seq, int(job.geo_pending)),
         )
         return True
 
 
-def expire_missing_jobs(source: str, seen_ids: set[str]):
+def expire_missing_jobs(source: str, seen_ids: set[str]) -> int:
     """Mark active jobs from `source` that weren't seen in this scan as expired."""
     if not seen_ids:
-        return
+        return 0
     placeholders = ",".join("?" * len(seen_ids))
-    with sqlite3.connect(DB_FILE) as conn:
-        conn.execute(
-            f"""UPDATE jobs SET status = 'expired'
+    with connect() as conn:
+        seq = _begin_change(conn)
+        return conn.execute(
+            f"""UPDATE jobs SET status = 'expired', change_seq = ?
                 WHERE source = ? AND status = 'active'
                 AND id NOT IN ({placeholders})""",
-            [source] + list(seen_ids),
-        )
+            [seq, source] + list(seen_ids),
+        ).rowcount
+
+
+INSERT_CHUNK = 76    # 76 lignes × 13 paramètres < 999, limite des vieux SQLite
+
+
+def save_source_result(source: str, jobs: list[JobOffer], duration_ms: int,
+                       cache_hits: int = 0, cache_checks: int = 0) -> tuple[list[JobOffer], int]:
+    """Persist a successful scan of `source` in one transaction: upsert every job,
+    expire the active ones not seen this time, record the source status.
+    Returns (brand-new jobs, number of jobs expired)."""
+    now = datetime.now().isoformat()
+    new_ids: set[str] = set()
+    expired = 0
+    with connect() as conn:
+        seq = _begin_change(conn)
+        for i in range(0, len(jobs), INSERT_CHUNK):
+            chunk = jobs[i:i + INSERT_CHUNK]
+            rows = conn.execute(
+                f"""INSERT INTO jobs
+                    (id, title, link, location, source, source_key, status, lat, lon,
+                     first_seen, last_seen, notified, change_seq, geo_pending)
+                    VALUES {",".join(["(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?)"] * len(chunk))}
+                    ON CONFLICT(id) DO UPDATE SET
+                      last_seen = excluded.last_seen, status = excluded.status,
+                      change_seq = CASE WHEN jobs.status != excluded.status
+                                        THEN excluded.change_seq ELSE jobs.change_seq END
+                    RETURNING id, first_seen""",
+                [v for j in chunk for v in (j.id, j.title, j.link, j.location, j.source,
+                                            source_key(j.source), j.status, j.lat, j.lon,
+                                            now, now, seq, int(j.geo_pending))],
+            ).fetchall()
+            new_ids.update(job_id for job_id, first_seen in rows if first_seen == now)
+        if jobs:
+            # Toutes les offres vues viennent de passer à last_seen = now : le reste a disparu
+            expired = conn.execute(
+                """UPDATE jobs SET status = 'expired', change_seq = ?
+                   WHERE source = ? AND status = 'active' AND last_seen < ?""",
+                (seq, source, now),
+            ).rowcount
+        _upsert_source_status(conn, source, "ok", len(jobs), duration_ms, None,
+                              cache_hits, cache_checks)
+    new: dict[str, JobOffer] = {}
+    for job in jobs:
+        if job.id in new_ids:
+            new.setdefault(job.id, job)
+    return list(new.values()), expired
+
+
+def get_pending_locations(limit: int, exclude: list[str] = ()) -> list[str]:
+    """Distinct locations of jobs still waiting for a geocode, except `exclude`."""
+    with connect() as conn:
+        return [r[0] for r in conn.execute(
+            """SELECT DISTINCT location FROM jobs WHERE geo_pending = 1
+               AND location NOT IN (SELECT value FROM json_each(?)) LIMIT ?""",
+            (json.dumps(list(exclude)), limit))]
+
+
+def resolve_pending_locations(resolved: list[tuple[str, float, float]]) -> int:
+    """Set the coordinates of every pending job at each (location, lat, lon) in one
+    transaction; they get a new change_seq so clients pick them up. Returns the job count."""
+    with connect() as conn:
+        seq = _begin_change(conn)
+        return sum(conn.execute(
+            """UPDATE jobs SET lat = ?, lon = ?, geo_pending = 0, change_seq = ?
+               WHERE geo_pending = 1 AND location = ?""",
+            (lat, lon, seq, location),
+        ).rowcount for location, lat, lon in resolved)
 
 
 def mark_notified(job_id: str):
-    with sqlite3.connect(DB_FILE) as conn:
+    with connect() as conn:
         conn.execute("UPDATE jobs SET notified = 1 WHERE id = ?", (job_id,))
 
 
-def get_jobs(source: Optional[str] = None,
-             status: Optional[str] = None,
-             q: Optional[str] = None) -> list[dict]:
-    query = "SELECT * FROM jobs WHERE 1=1"
+# source_key, change_seq et geo_pending restent internes
+JOB_FIELDS = ("id", "title", "link", "location", "source", "status", "lat", "lon",
+              "first_seen", "last_seen", "notified")
+SORTS = {"recent": "DESC", "oldest": "ASC"}
+
+
+def _pack(key, job_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{key}|{job_id}".encode()).decode()
+
+
+def _unpack(cursor: str) -> tuple[str, str]:
+    try:
+        key, job_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Curseur invalide")
+    return key, job_id
+
+
+def _check_fields(fields: Optional[list[str]]):
+    unknown = set(fields or ()) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"Champ(s) inconnu(s) : {', '.join(sorted(unknown))}")
+
+
+def _jobs_filter(source: Optional[str], status: Optional[str],
+                 q: Optional[str]) -> tuple[str, list[str], list, bool]:
+    """FROM clause, WHERE terms and parameters shared by the listing and its count.
+    The last item tells whether the full-text index is joined."""
+    from_ = "jobs"
+    where: list[str] = []
     params: list = []
+    match = match_expression(q) if q else None
+    fts = bool(match) and search_enabled()
+    if fts:
+        from_ += " JOIN jobs_fts ON jobs_fts.rowid = jobs.rowid"
+        where.append("jobs_fts MATCH ?")
+        params.append(match)
+    elif q:
+        where.append("(LOWER(title) LIKE ? OR LOWER(location) LIKE ?)")
+        params += [f"%{q.lower()}%", f"%{q.lower()}%"]
     if source:
-        query += " AND LOWER(source) = LOWER(?)"
-        params.append(source)
+        where.append("source_key = ?")
+        params.append(source_key(source))
     if status:
-        query += " AND status = ?"
+        where.append("status = ?")
         params.append(status)
-    if q:
-        query += " AND (LOWER(title) LIKE ? OR LOWER(location) LIKE ?)"
-        params += [f"%{q.lower()}%", f"%{q.lower()}%"]
-    query += " ORDER BY first_seen DESC"
-    with sqlite3.connect(DB_FILE) as conn:
-        conn.row_factory = sqlite3.Row
+    return from_, where, params, fts
+
+
+def jobs_query(source: Optional[str] = None,
+               status: Optional[str] = None,
+               q: Optional[str] = None,
+               sort: str = "recent",
+               cursor: Optional[str] = None,
+               limit: Optional[int] = None,
+               fields: Optional[list[str]] = None) -> tuple[str, list]:
+    """SQL and parameters behind get_jobs (also used by the benches for EXPLAIN).
+    Rows come in (first_seen, id) order, newest first unless sort="oldest"; `cursor`
+    (the next_cursor of a page) resumes right after a given row. sort="relevance" orders
+    full-text matches by BM25 and cannot be paged with a cursor.
+    Raises ValueError on an unknown field or sort, or a bad cursor."""
+    _check_fields(fields)
+    if sort not in SORTS and sort != "relevance":
+        raise ValueError(f"Tri inconnu : {sort}")
+    from_, where, params, fts = _jobs_filter(source, status, q)
+
+    direction = SORTS.get(sort, "DESC")
+    order = f"jobs.first_seen {direction}, jobs.id {direction}"
+    if sort == "relevance" and fts:
+        order = f"bm25(jobs_fts, {', '.join(map(str, SEARCH_WEIGHTS))}), " + order
+    if cursor:
+        if sort == "relevance":
+            raise ValueError("Pas de curseur avec sort=relevance")
+        where.append(f"(jobs.first_seen, jobs.id) {'<' if direction == 'DESC' else '>'} (?, ?)")
+        params += _unpack(cursor)
+
+    # first_seen et id restent sélectionnés : ils servent au curseur de la page suivante
+    columns = ", ".join(f"jobs.{f}" for f in dict.fromkeys([*(fields or JOB_FIELDS), "first_seen", "id"]))
+    query = f"SELECT {columns} FROM {from_}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += " ORDER BY " + order
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    return query, params
+
+
+def get_jobs(source: Optional[str] = None,
+             status: Optional[str] = None,
+             q: Optional[str] = None,
+             sort: str = "recent") -> list[dict]:
+    query, params = jobs_query(source, status, q, sort)
+    with connect() as conn:
         rows = conn.execute(query, params).fetchall()
         return [dict(r) for r in rows]
 
 
+def get_jobs_page(source: Optional[str] = None,
+                  status: Optional[str] = None,
+                  q: Optional[str] = None,
+                  sort: str = "recent",
+                  cursor: Optional[str] = None,
+                  limit: int = 100,
+                  fields: Optional[list[str]] = None) -> tuple[list[dict], Optional[str]]:
+    """One page of jobs and the cursor of the next one (None on the last page)."""
+    query, params = jobs_query(source, status, q, sort, cursor, limit + 1, fields)
+    with connect() as conn:
+        rows = [dict(r) for r in conn.execute(query, params).fetchall()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if sort != "relevance":
+            next_cursor = _pack(rows[-1]["first_seen"], rows[-1]["id"])
+    if fields:
+        rows = [{f: r[f] for f in fields} for r in rows]
+    return rows, next_cursor
+
+
+def count_jobs(source: Optional[str] = None,
+               status: Optional[str] = None,
+               q: Optional[str] = None) -> int:
+    from_, where, params, _ = _jobs_filter(source, status, q)
+    query = f"SELECT COUNT(*) FROM {from_}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    with connect() as conn:
+        return conn.execute(query, params).fetchone()[0]
+
+
+def changes_head() -> str:
+    """Changes cursor pointing after the latest change: a client that has just
+    loaded the list resumes /api/jobs/changes from here."""
+    with connect() as conn:
+        row = conn.execute(
+            "SELECT change_seq, id FROM jobs ORDER BY change_seq DESC, id DESC LIMIT 1"
+        ).fetchone()
+    return _pack(row["change_seq"], row["id"]) if row else _pack(0, "")
+
+
+def get_job_changes(since: Optional[str] = None, limit: int = 500,
+                    fields: Optional[list[str]] = None) -> tuple[list[dict], str, bool]:
+    """Jobs inserted or whose status changed after `since` (a changes cursor; None
+    = from the start), in change order. Returns (jobs, next cursor, more pending).
+    Raises ValueError on a bad cursor or an unknown field."""
+    _check_fields(fields)
+    seq, job_id = 0, ""
+    if since:
+        key, job_id = _unpack(since)
+        try:
+            seq = int(key)
+        except ValueError:
+            raise ValueError("Curseur invalide")
+    with connect() as conn:
+        rows = [dict(r) for r in conn.execute(
+            f"""SELECT {', '.join(JOB_FIELDS)}, change_seq FROM jobs WHERE (change_seq, id) > (?, ?)
+               ORDER BY change_seq, id LIMIT ?""",
+            (seq, job_id, limit + 1),
+        ).fetchall()]
+    more = len(rows) > limit
+    rows = rows[:limit]
+    cursor = _pack(rows[-1]["change_seq"], rows[-1]["id"]) if rows else (since or _pack(0, ""))
+    rows = [{f: r[f] for f in fields or JOB_FIELDS} for r in rows]
+    return rows, cursor, more
+
+
 def get_sources() -> list[str]:
-    with sqlite3.connect(DB_FILE) as conn:
+    with connect() as conn:
         rows = conn.execute(
             "SELECT DISTINCT source FROM jobs ORDER BY source"
         ).fetchall()
         return [r[0] for r in rows]
 
 
+# Une requête, un aller-retour : chaque compteur est un parcours de plage sur
+# idx_jobs_status_recent (COUNT(*) nu est optimisé par SQLite), new_48h une simple recherche
+STATS_QUERY = """
+    SELECT (SELECT COUNT(*) FROM jobs),
+           (SELECT COUNT(*) FROM jobs WHERE status = 'active'),
+           (SELECT COUNT(*) FROM jobs WHERE status = 'full'),
+           (SELECT COUNT(*) FROM jobs WHERE status = 'expired'),
+           (SELECT COUNT(*) FROM jobs WHERE status = 'active'
+                                        AND first_seen >= datetime('now','-48 hours'))"""
+
+
 def get_stats() -> dict:
-    with sqlite3.connect(DB_FILE) as conn:
-        total   = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
-        active  = conn.execute("SELECT COUNT(*) FROM jobs WHERE status='active'").fetchone()[0]
-        full    = conn.execute("SELECT COUNT(*) FROM jobs WHERE status='full'").fetchone()[0]
-        expired = conn.execute("SELECT COUNT(*) FROM jobs WHERE status='expired'").fetchone()[0]
-        new_24h = conn.execute(
-            "SELECT COUNT(*) FROM jobs WHERE status='active' AND first_seen >= datetime('now','-48 hours')"
-        ).fetchone()[0]
-    return {"total": total, "active": active, "full": full, "expired": expired, "new_48h": new_24h}
+    with connect() as conn:
+        total, active, full, expired, new_48h = conn.execute(STATS_QUERY).fetchone()
+    return {"total": total, "active": active, "full": full, "expired": expired, "new_48h": new_48h}
 
 
 def get_meta(key: str) -> Optional[str]:
-    with sqlite3.connect(DB_FILE) as conn:
+    with connect() as conn:
         row = conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
         return row[0] if row else None
 
 
 def set_meta(key: str, value: str):
-    with sqlite3.connect(DB_FILE) as conn:
+    with connect() as conn:
         conn.execute(
             "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
         )
 
 
 def update_source_status(source: str, status: str, jobs_found: int,
-                         duration_ms: int, error_msg: Optional[str] = None):
-    with sqlite3.connect(DB_FILE) as conn:
+                         duration_ms: int, error_msg: Optional[str] = None,
+                         cache_hits: int = 0, cache_checks: int = 0):
+    with connect() as conn:
+        _upsert_source_status(conn, source, status, jobs_found, duration_ms, error_msg,
+                              cache_hits, cache_checks)
+
+
+def _upsert_source_status(conn: sqlite3.Connection, source: str, status: str, jobs_found: int,
+                          duration_ms: int, error_msg: Optional[str],
+                          cache_hits: int, cache_checks: int):
+    conn.execute(
+        """INSERT INTO source_status
+           (source, last_check, status, jobs_found, duration_ms, error_msg,
+            cache_hits, cache_checks)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(source) DO UPDATE SET
+             last_check = excluded.last_check, status = excluded.status,
+             jobs_found = excluded.jobs_found, duration_ms = excluded.duration_ms,
+             error_msg = excluded.error_msg, cache_hits = excluded.cache_hits,
+             cache_checks = excluded.cache_checks""",
+        (source, datetime.now().isoformat(), status, jobs_found, duration_ms, error_msg,
+         cache_hits, cache_checks),
+    )
+
+
+def update_source_schedule(source: str, next_due: str, poll_interval_min: int, fail_streak: int,
+                           circuit_state: str = "closed", open_until: Optional[str] = None):
+    with connect() as conn:
         conn.execute(
-            """INSERT OR REPLACE INTO source_status
-               (source, last_check, status, jobs_found, duration_ms, error_msg)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (source, datetime.now().isoformat(), status, jobs_found, duration_ms, error_msg),
+            """UPDATE source_status
+               SET next_due = ?, poll_interval_min = ?, fail_streak = ?,
+                   circuit_state = ?, open_until = ?
+               WHERE source = ?""",
+            (next_due, poll_interval_min, fail_streak, circuit_state, open_until, source),
         )
 
 
+def set_circuit_state(source: str, circuit_state: str):
+    with connect() as conn:
+        conn.execute(
+            "UPDATE source_status SET circuit_state = ? WHERE source = ?",
+            (circuit_state, source),
+        )
+
+
+def get_source_schedule() -> dict[str, dict]:
+    """Per-source polling and circuit-breaker state."""
+    with connect() as conn:
+        rows = conn.execute(
+            """SELECT source, last_check, next_due, poll_interval_min, fail_streak,
+                      circuit_state, open_until
+               FROM source_status"""
+        ).fetchall()
+        return {r["source"]: dict(r) for r in rows}
+
+
+def get_next_due() -> Optional[str]:
+    with connect() as conn:
+        return conn.execute("SELECT MIN(next_due) FROM source_status").fetchone()[0]
+
+
 def get_source_statuses() -> list[dict]:
-    with sqlite3.connect(DB_FILE) as conn:
-        conn.row_factory = sqlite3.Row
+    with connect() as conn:
         rows = conn.execute(
             "SELECT * FROM source_status ORDER BY source"
         ).fetchall()
         return [dict(r) for r in rows]
+
+
+def get_http_cache(url: str) -> Optional[dict]:
+    with connect() as conn:
+        row = conn.execute("SELECT * FROM http_cache WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+
+def put_http_cache(url: str, etag: Optional[str], last_modified: Optional[str],
+                   body_hash: str, results: str):
+    with connect() as conn:
+        conn.execute(
+            """INSERT OR REPLACE INTO http_cache
+               (url, etag, last_modified, body_hash, results, parsed_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (url, etag, last_modified, body_hash, results, datetime.now().isoformat()),
+        )
+
+
+def load_geocache() -> tuple[dict[str, tuple[float, float]], dict[str, float]]:
+    """Every cached location → (lat, lon), and unexpired misses → expires_at."""
+    with connect() as conn:
+        hits = {r[0]: (r[1], r[2]) for r in conn.execute("SELECT location, lat, lon FROM geocache")}
+        misses = dict(conn.execute(
+            "SELECT location, expires_at FROM geocache_miss WHERE expires_at > ?", (time.time(),)))
+        return hits, misses
+
+
+def save_geocache(hits: list[tuple[str, float, float]], misses: list[tuple[str, float]]):
+    """Write a batch of geocoding results in one transaction."""
+    with connect() as conn:
+        conn.executemany("INSERT OR REPLACE INTO geocache (location, lat, lon) VALUES (?, ?, ?)", hits)
+        conn.executemany("DELETE FROM geocache_miss WHERE location = ?", [(h[0],) for h in hits])
+        conn.executemany("INSERT OR REPLACE INTO geocache_miss (location, expires_at) VALUES (?, ?)",
+                         misses)
+        conn.execute("DELETE FROM geocache_miss WHERE expires_at <= ?", (time.time(),))
+
+
+def acquire_lease(name: str, holder: str, ttl_seconds: float) -> bool:
+    """Take or renew the lease `name` for `ttl_seconds`. Succeeds if it is free,
+    expired or already ours; atomic across processes sharing the database."""
+    now = time.time()
+    with connect() as conn:
+        row = conn.execute(
+            """INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)
+               ON CONFLICT(name) DO UPDATE SET
+                 holder = excluded.holder, expires_at = excluded.expires_at
+               WHERE leases.holder = excluded.holder OR leases.expires_at < ?
+               RETURNING holder""",
+            (name, holder, now + ttl_seconds, now),
+        ).fetchone()
+    return row is not None
+
+
+def release_lease(name: str, holder: str):
+    with connect() as conn:
+        conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+
+
+# ── File des scans (API → worker scanner) ────────────────────────────────────
+
+SCAN_HISTORY = 50
+
+
+def _scan_row(row) -> dict:
+    scan = dict(row)
+    scan.pop("holder", None)   # interne au worker (host:pid), pas exposé par /api/scan
+    for key in ("requested", "sources", "skipped"):
+        scan[key] = json.loads(scan[key]) if scan[key] else None
+    return scan
+
+
+def enqueue_scan(scan_id: str, sources: list[str], forced: bool = False):
+    """Queue a scan; `forced` when the sources were named explicitly (bypasses the breaker)."""
+    with connect() as conn:
+        conn.execute(
+            "INSERT INTO scans (id, status, requested, forced, requested_at) VALUES (?, 'queued', ?, ?, ?)",
+            (scan_id, json.dumps(sources), int(forced), datetime.now().isoformat()),
+        )
+
+
+def claim_queued_scan(holder: str) -> Optional[dict]:
+    """Oldest queued scan, atomically switched to running under `holder`
+    (None if the queue is empty)."""
+    with connect() as conn:
+        row = conn.execute(
+            """UPDATE scans SET status = 'running', started_at = ?, holder = ?
+               WHERE id = (SELECT id FROM scans WHERE status = 'queued'
+                           ORDER BY requested_at LIMIT 1)
+               RETURNING *""",
+            (datetime.now().isoformat(), holder),
+        ).fetchone()
+        return _scan_row(row) if row else None
+
+
+def record_scan(scan_id: str, status: str, requested: list[str], sources: list[str],
+                skipped: list[str], holder: Optional[str] = None):
+    """Create or update the record of a scan the worker is starting (or skipping)."""
+    now = datetime.now().isoformat()
+    with connect() as conn:
+        conn.execute(
+            """INSERT INTO scans (id, status, requested, sources, skipped, holder, requested_at, started_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET
+                 status = excluded.status, sources = excluded.sources,
+                 skipped = excluded.skipped, started_at = excluded.started_at,
+                 holder = COALESCE(excluded.holder, scans.holder)""",
+            (scan_id, status, json.dumps(requested), json.dumps(sources), json.dumps(skipped),
+             holder, now, now),
+        )
+
+
+def finish_scan(scan_id: str, status: str, new_jobs: int):
+    with connect() as conn:
+        conn.execute(
+            "UPDATE scans SET status = ?, new_jobs = ?, finished_at = ? WHERE id = ?",
+            (status, new_jobs, datetime.now().isoformat(), scan_id),
+        )
+        conn.execute(
+            """DELETE FROM scans WHERE status NOT IN ('queued', 'running') AND id NOT IN
+               (SELECT id FROM scans ORDER BY requested_at DESC LIMIT ?)""",
+            (SCAN_HISTORY,),
+        )
+
+
+def fail_stale_scans(holder: str) -> int:
+    """Mark scans left running by other (dead) workers as failed, keeping `holder`'s
+    own (called when a worker takes over the lease)."""
+    with connect() as conn:
+        return conn.execute(
+            """UPDATE scans SET status = 'error', finished_at = ?
+               WHERE status = 'running' AND (holder IS NULL OR holder != ?)""",
+            (datetime.now().isoformat(), holder),
+        ).rowcount
+
+
+def get_scan(scan_id: str) -> Optional[dict]:
+    with connect() as conn:
+        row = conn.execute("SELECT * FROM scans WHERE id = ?", (scan_id,)).fetchone()
+        return _scan_row(row) if row else None
+
+
+def scan_running() -> bool:
+    with connect() as conn:
+        return conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM scans WHERE status = 'running')").fetchone()[0] == 1
+
+
+# ── Journal d'événements (worker scanner → flux SSE de l'API) ────────────────
+
+def append_events(batch: list[tuple[str, str]]):
+    """Store (type, JSON data) events in one transaction."""
+    now = time.time()
+    with connect() as conn:
+        conn.executemany("INSERT INTO events (type, data, created_at) VALUES (?, ?, ?)",
+                         [(t, d, now) for t, d in batch])
+
+
+def get_events_after(last_id: int, limit: int = 500) -> list[dict]:
+    with connect() as conn:
+        rows = conn.execute(
+            "SELECT * FROM events WHERE id > ? ORDER BY id LIMIT ?", (last_id, limit)
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def last_event_id() -> int:
+    with connect() as conn:
+        return conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+
+
+def prune_events(max_age_seconds: float):
+    with connect() as conn:
+        conn.execute("DELETE FROM events WHERE created_at < ?", (time.time() - max_age_seconds,))
@@ -0,0 +1,113 @@
+"""
+Process scanner, séparé de l'API : python -m scanner worker
+Les scrapers (BS4, Playwright) tournent ici et ne prennent plus de CPU ni de
+GIL au serveur uvicorn. Le worker dépile les scans demandés par POST /api/scan
+(table scans), lance les passages planifiés toutes les SCHEDULER_TICK_MINUTES,
+géocode en tâche de fond les lieux des offres geo_pending et écrit ses
+événements dans la table events, que l'API relaie en SSE.
+Plusieurs workers peuvent tourner : seul le détenteur du bail « scanner » scanne.
+"""
+import argparse
+import logging
+import os
+import signal
+import threading
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from dotenv import load_dotenv
+
+import browser_pool
+import events
+import geocoder
+import leader
+import scanner
+import storage
+from scrapers.registry import select_sources
+
+log = logging.getLogger(__name__)
+
+POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", "2"))
+GEOCODE_POLL_SECONDS = float(os.getenv("GEOCODE_POLL_SECONDS", "10"))
+
+
+def _take_over():
+    """Lease just acquired: fail scans orphaned by previous holders (ours keep
+    running), then scan the sources that went stale (a restart doesn't re-crawl
+    fresh ones)."""
+    stale = storage.fail_stale_scans(scanner.holder)
+    if stale:
+        log.warning(f"{stale} scan(s) interrompu(s) par l'arrêt du worker précédent")
+    scanner.warm_start()
+
+
+def _run_queued(scan: dict):
+    try:
+        sources = select_sources(scan["requested"])
+    except ValueError as e:   # catalogue modifié entre la demande et l'exécution
+        log.error(f"Scan {scan['id']}: {e}")
+        storage.finish_scan(scan["id"], "error", 0)
+        return
+    scanner._run(sources, scan["id"], forced=bool(scan["forced"]))
+
+
+def _geocode_loop(stop: threading.Event, lease: leader.Lease):
+    while not stop.wait(GEOCODE_POLL_SECONDS):
+        if not lease.held:
+            continue
+        try:
+            while not stop.is_set() and geocoder.backfill():
+                pass
+        except Exception as e:
+            log.warning(f"Géocodage en tâche de fond en échec: {e}")
+
+
+def _spawn(target, *args, name: str):
+    # Thread dédié par scan : un scan dure des minutes, la boucle continue de dépiler
+    threading.Thread(target=target, args=args, name=name, daemon=True).start()
+
+
+def run(stop: threading.Event):
+    storage.init_db()
+    events.relay(stop)
+    lease = leader.Lease("scanner", on_acquire=_take_over)
+    scanner.holder = lease.holder
+    lease.start()
+
+    sched = BackgroundScheduler()
+    sched.add_job(
+        lambda: lease.held and scanner.run_due(),
+        "interval",
+        minutes=scanner.TICK_MINUTES,
+        id="auto_scan",
+    )
+    sched.start()
+    _spawn(_geocode_loop, stop, lease, name="geocode")
+    log.info(f"Worker scanner démarré ({lease.holder})")
+
+    while not stop.wait(POLL_SECONDS):
+        if not lease.held:
+            continue
+        try:
+            while scan := storage.claim_queued_scan(lease.holder):
+                _spawn(_run_queued, scan, name=f"scan-{scan['id']}")
+        except Exception as e:
+            log.warning(f"File des scans: lecture en échec: {e}")
+
+    log.info("Arrêt du worker scanner")
+    sched.shutdown(wait=False)
+    lease.stop()
+    browser_pool.shutdown()
+
+
+def main(argv: list[str] | None = None):
+    ap = argparse.ArgumentParser(prog="python -m scanner")
+    sub = ap.add_subparsers(dest="command", required=True)
+    sub.add_parser("worker", help="dépile les scans demandés et lance les passages planifiés")
+    ap.parse_args(argv)
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s — %(message)s")
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    run(stop)
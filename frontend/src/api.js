@@ -6,13 +6,40 @@ async function get(path) {
   return res.json()
 }
 
-export const getJobs = async (filters = {}) => {
-  const p = new URLSearchParams()
+// Champs affichés par JobCard / MapPanel : le reste de l'offre ne transite pas
+const JOB_FIELDS = 'id,title,link,location,source,status,lat,lon,first_seen'
+const PAGE_SIZE = 200
+
+// Une page d'offres ; rappeler avec `cursor: page.nextCursor` pour la suivante (null = fin)
+export const getJobs = async (filters = {}, { cursor = null, limit = PAGE_SIZE } = {}) => {
+  const p = new URLSearchParams({ limit, fields: JOB_FIELDS })
   if (filters.source) p.append('source', filters.source)
   if (filters.status && filters.status !== 'all') p.append('status', filters.status)
   if (filters.q) p.append('q', filters.q)
+  if (filters.sort === 'asc') p.append('sort', 'oldest')
+  if (cursor) p.append('cursor', cursor)
   const data = await get(`/jobs?${p}`)
-  return data.jobs ?? []
+  return {
+    jobs: data.jobs ?? [],
+    nextCursor: data.next_cursor ?? null,
+    changesCursor: data.changes_cursor ?? null,
+    matched: data.matched ?? 0,
+  }
+}
+
+// Offres créées ou ayant changé de statut depuis `since` (curseur de getJobs ou d'un appel précédent)
+export const getJobChanges = async (since) => {
+  const jobs = []
+  let cursor = since
+  let data
+  do {
+    const p = new URLSearchParams({ fields: JOB_FIELDS })
+    if (cursor) p.append('since', cursor)
+    data = await get(`/jobs/changes?${p}`)
+    jobs.push(...(data.jobs ?? []))
+    cursor = data.cursor
+  } while (data.more)
+  return { jobs, cursor, stats: { active: data.active, total: data.total, new_48h: data.new_48h } }
 }
 
 export const getSources = async () => {
@@ -26,3 +53,14 @@ export const getScannerStatus = async () => {
   const data = await get('/scanner')
   return data.sources ?? []
 }
+
+// Flux SSE du scanner ; handlers : { scan_start, source_start, source_done, job_new, scan_done, geo_resolved, open }
+// EventSource se reconnecte seul ; renvoie la fonction de fermeture
+export const subscribeEvents = (handlers) => {
+  const es = new EventSource(`${BASE}/events`)
+  for (const [type, fn] of Object.entries(handlers)) {
+    if (type === 'open') es.onopen = fn
+    else es.addEventListener(type, (e) => fn(JSON.parse(e.data)))
+  }
+  return () => es.close()
+}
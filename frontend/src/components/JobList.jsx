@@ -1,6 +1,8 @@
 import JobCard from './JobCard'
 
-export default function JobList({ jobs, selectedIdx, onSelect }) {
+const END_MARGIN_PX = 400
+
+export default function JobList({ jobs, selectedIdx, onSelect, onEndReached }) {
   if (!jobs.length) {
     return (
       <div className="jobs-list">
@@ -19,8 +21,13 @@ export default function JobList({ jobs, selectedIdx, onSelect }) {
     groups[job.source].push({ job, i })
   })
 
+  const onScroll = (e) => {
+    const el = e.currentTarget
+    if (onEndReached && el.scrollTop + el.clientHeight >= el.scrollHeight - END_MARGIN_PX) onEndReached()
+  }
+
   return (
-    <div className="jobs-list">
+    <div className="jobs-list" onScroll={onScroll}>
       {groupOrder.map(src => {
         const items = groups[src]
         return (
@@ -1,5 +1,5 @@
 import { useState, useEffect, useCallback, useRef, useMemo } from 'react'
-import { getJobs, getSources, getStatus, getScannerStatus } from '../api'
+import { getJobs, getJobChanges, getSources, getStatus, getScannerStatus, subscribeEvents } from '../api'
 import Header from '../components/Header'
 import FilterBar from '../components/FilterBar'
 import ScannerStatus from '../components/ScannerStatus'
@@ -12,8 +12,36 @@ const CAPTAIN_RE = /\b(captain|cpt|cdr|commander)\b/i
 const FO_RE      = /\b(first officer|f\/o)\b/i
 const MOBILE_BP = 768
 
+// Ordre serveur : (first_seen, id), décroissant par défaut
+const compareJobs = (sort) => (a, b) => {
+  const d = a.first_seen < b.first_seen ? -1 : a.first_seen > b.first_seen ? 1 : a.id < b.id ? -1 : a.id > b.id ? 1 : 0
+  return sort === 'asc' ? d : -d
+}
+
+const matchesFilters = (job, filters) =>
+  (!filters.source || job.source.toLowerCase() === filters.source.toLowerCase()) &&
+  (!filters.status || filters.status === 'all' || job.status === filters.status)
+
+// Applique un lot de changements à la liste chargée : retire les anciennes versions,
+// insère à sa place chaque offre qui passe les filtres (si elle tombe dans la partie déjà chargée)
+function mergeChanges(list, changes, filters, complete) {
+  const changed = new Set(changes.map(j => j.id))
+  const cmp = compareJobs(filters.sort)
+  const merged = list.filter(j => !changed.has(j.id))
+  const last = merged[merged.length - 1]
+  for (const job of changes) {
+    if (!matchesFilters(job, filters)) continue
+    if (!complete && last && cmp(job, last) > 0) continue   // arrivera avec sa page
+    merged.push(job)
+  }
+  return merged.sort(cmp)
+}
+
 export default function Scanner() {
   const [jobs, setJobs] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [changesCursor, setChangesCursor] = useState(null)
+  const [matched, setMatched] = useState(0)
   const [sources, setSources] = useState([])
   const [scannerSrcs, setScannerSrcs] = useState([])
   const [stats, setStats] = useState({ active: 0, total: 0, new_48h: 0 })
@@ -24,26 +52,55 @@ export default function Scanner() {
   const [leftPct, setLeftPct] = useState(35)
   const [activeTab, setActiveTab] = useState('list')
   const dragging = useRef(false)
+  const loadingMore = useRef(false)
+  const listGen = useRef(0)   // incrémenté à chaque rechargement : une page en retard est ignorée
 
   const isMobile = () => window.innerWidth <= MOBILE_BP
 
   const loadJobs = useCallback(async () => {
-    const data = await getJobs(filters)
-    setJobs(data)
+    const gen = ++listGen.current
+    const page = await getJobs(filters)
+    if (gen !== listGen.current) return
+    setJobs(page.jobs)
+    setNextCursor(page.nextCursor)
+    setChangesCursor(page.changesCursor)
+    setMatched(page.matched)
   }, [filters])
 
-  const visibleJobs = useMemo(() => {
-    let list = jobs
-    if (filters.role) {
-      const re = filters.role === 'captain' ? CAPTAIN_RE : FO_RE
-      list = list.filter(j => re.test(j.title))
+  // Synchro incrémentale : seules les offres nouvelles ou ayant changé de statut transitent
+  const syncChanges = useCallback(async () => {
+    if (!changesCursor) return
+    const gen = listGen.current
+    const delta = await getJobChanges(changesCursor)
+    if (gen !== listGen.current) return
+    setChangesCursor(delta.cursor)
+    setStats(delta.stats)
+    if (!delta.jobs.length) return
+    if (filters.q) { loadJobs(); return }   // recherche plein texte : pas rejouable côté client
+    setJobs(prev => mergeChanges(prev, delta.jobs, filters, !nextCursor))
+  }, [changesCursor, filters, nextCursor, loadJobs])
+
+  // Pages suivantes à la demande (fin de liste atteinte), dans l'ordre du serveur
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore.current) return
+    loadingMore.current = true
+    const gen = listGen.current
+    try {
+      const page = await getJobs(filters, { cursor: nextCursor })
+      if (gen !== listGen.current) return
+      setJobs(prev => [...prev, ...page.jobs])
+      setNextCursor(page.nextCursor)
+    } finally {
+      loadingMore.current = false
     }
-    return [...list].sort((a, b) => {
-      const ta = new Date(a.first_seen).getTime()
-      const tb = new Date(b.first_seen).getTime()
-      return filters.sort === 'asc' ? ta - tb : tb - ta
-    })
-  }, [jobs, filters.role, filters.sort])
+  }, [filters, nextCursor])
+
+  // Tri par date fait côté serveur (sort=recent|oldest) : seul le filtre rôle reste client-side
+  const visibleJobs = useMemo(() => {
+    if (!filters.role) return jobs
+    const re = filters.role === 'captain' ? CAPTAIN_RE : FO_RE
+    return jobs.filter(j => re.test(j.title))
+  }, [jobs, filters.role])
 
   const loadMeta = useCallback(async () => {
     const [srcs, scannerData, statusData] = await Promise.all([
@@ -65,6 +122,19 @@ export default function Scanner() {
   useEffect(() => { loadJobs() }, [loadJobs])
   useEffect(() => { loadMeta() }, [loadMeta])
 
+  // Mises à jour poussées par le serveur (SSE) au lieu d'un polling : une source
+  // terminée → delta des offres + statut scanner ; lieux géocodés → delta (nouvelles
+  // coordonnées) ; (re)connexion → rattrapage
+  const live = useRef({})
+  live.current = { syncChanges, loadMeta }
+  useEffect(() => subscribeEvents({
+    open: () => live.current.syncChanges(),
+    source_done: () => { live.current.syncChanges(); live.current.loadMeta() },
+    scan_start: () => live.current.loadMeta(),
+    scan_done: () => live.current.loadMeta(),
+    geo_resolved: () => live.current.syncChanges(),
+  }), [])
+
   const handleSelect = useCallback((idx) => {
     setSelectedIdx(idx)
     if (isMobile()) setActiveTab('map')
@@ -95,8 +165,10 @@ export default function Scanner() {
           <ScannerStatus sources={scannerSrcs} />
           <div className="count-bar">
             {visibleJobs.length} offre{visibleJobs.length !== 1 ? 's' : ''} affichée{visibleJobs.length !== 1 ? 's' : ''}
+            {nextCursor && <> · <strong>{matched}</strong> au total</>}
           </div>
-          <JobList jobs={visibleJobs} selectedIdx={selectedIdx} onSelect={handleSelect} />
+          <JobList jobs={visibleJobs} selectedIdx={selectedIdx} onSelect={handleSelect}
+                   onEndReached={nextCursor ? loadMore : null} />
         </div>
 
         <div className="drag-handle" onMouseDown={() => { dragging.current = true }} />